@@ -1,27 +1,253 @@
-from flask import Flask, request, jsonify, render_template_string
-import re
+from flask import Flask, Request, Response, request, jsonify, render_template_string, send_file, stream_with_context
 import os
+import functools
 import logging
-import io
-
-# Import for document processing
-try:
-    import zipfile
-    import xml.etree.ElementTree as ET
-    import PyPDF2
-except ImportError:
-    zipfile = None
-    ET = None
-    PyPDF2 = None
+import json
+import time
+import hashlib
+import hmac
+import math
+import shutil
+import tempfile
+import threading
+import sqlite3
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import MetricsRegistry
+from profiling import PROFILE_MODES, find_profile, profile_call
+from jobs import JobStore
+from search import CandidateIndex, SearchQueryError
+from resume_parser import (
+    PARSER_VERSION, MinHashIndex, get_skill_matcher, limit_worker_memory, process_resume_path, sniff_format, warm_up
+)
+from resume_parser.storage import TieredCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+
+class SpoolingRequest(Request):
+    """Request that writes every uploaded file straight to a named temp file.
+    
+    Workers then open uploads by path instead of receiving a pickled copy of
+    the bytes. The files are deleted when the request is closed.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.NamedTemporaryFile('wb+', dir=app.config['SPOOL_DIR'], prefix='upload-')
+
+
 app = Flask(__name__)
+app.request_class = SpoolingRequest
 
 # Configuration
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_CONTENT_LENGTH', 512 * 1024 * 1024))  # whole request
+app.config['MAX_FILE_SIZE'] = int(os.environ.get('MAX_FILE_SIZE', 16 * 1024 * 1024))  # per file, larger ones fail alone
+app.config['SPOOL_DIR'] = os.environ.get('SPOOL_DIR') or os.path.join(tempfile.gettempdir(), 'resume-parser-spool')
+app.config['PARSE_POOL_SIZE'] = int(os.environ.get('PARSE_POOL_SIZE', min(4, os.cpu_count() or 1)))  # 0 = parse inline
+app.config['WARMUP_PARSES'] = os.environ.get('WARMUP_PARSES', '1') != '0'  # parse sample files at import, before serving
+app.config['PARSE_FILE_TIMEOUT'] = float(os.environ.get('PARSE_FILE_TIMEOUT', 60))  # seconds per file
+app.config['INLINE_PARSE_MAX_BYTES'] = int(os.environ.get('INLINE_PARSE_MAX_BYTES', 64 * 1024))  # single small text files skip the pool
+app.config['PARSE_MAX_CONCURRENT'] = int(os.environ.get('PARSE_MAX_CONCURRENT', 2 * max(app.config['PARSE_POOL_SIZE'], 1)))  # 0 = unlimited
+app.config['PARSE_MAX_QUEUED'] = int(os.environ.get('PARSE_MAX_QUEUED', 8))  # /parse requests waiting for a slot before 503
+app.config['JOBS_MAX_CONCURRENT'] = int(os.environ.get('JOBS_MAX_CONCURRENT', 4))  # 0 = unlimited
+app.config['JOBS_MAX_QUEUED'] = int(os.environ.get('JOBS_MAX_QUEUED', 8))  # POST /jobs requests waiting before 503
+app.config['QUEUE_WAIT_TIMEOUT'] = float(os.environ.get('QUEUE_WAIT_TIMEOUT', 30))  # seconds a queued request waits
+app.config['READY_MAX_IN_FLIGHT'] = int(os.environ.get('READY_MAX_IN_FLIGHT', 0))  # files being parsed before /ready fails, 0 = unlimited
+app.config['READY_MAX_QUEUED'] = int(os.environ.get('READY_MAX_QUEUED', max(app.config['PARSE_MAX_QUEUED'] // 2, 1)))  # waiting requests, 0 = unlimited
+app.config['READY_MAX_P95'] = float(os.environ.get('READY_MAX_P95', 10))  # seconds of recent /parse p95 latency, 0 = unlimited
+app.config['READY_MAX_POOL_UTILIZATION'] = float(os.environ.get('READY_MAX_POOL_UTILIZATION', 2))  # pool tasks per process, 0 = unlimited
+app.config['READY_LATENCY_WINDOW'] = float(os.environ.get('READY_LATENCY_WINDOW', 60))  # seconds of latencies behind the p95
+app.config['JOB_QUEUE_MAX_FILES'] = int(os.environ.get('JOB_QUEUE_MAX_FILES', 1000))  # pending files before 429
+app.config['JOB_FILES_IN_FLIGHT'] = int(os.environ.get('JOB_FILES_IN_FLIGHT', max(app.config['PARSE_POOL_SIZE'], 1)))  # job files handed to the pool at once
+app.config['JOB_TTL'] = float(os.environ.get('JOB_TTL', 3600))  # seconds to keep finished jobs
+app.config['JOB_STORE_PATH'] = os.environ.get('JOB_STORE_PATH') or os.path.join(tempfile.gettempdir(), 'resume-parser-jobs.db')  # SQLite file shared by workers
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # in-process LRU size
+app.config['RESULT_CACHE_PATH'] = os.environ.get('RESULT_CACHE_PATH') or None  # SQLite file shared by workers
+app.config['DEDUP_ENABLED'] = os.environ.get('DEDUP_ENABLED', '1') != '0'  # flag near-duplicate resumes
+app.config['DEDUP_INDEX_PATH'] = os.environ.get('DEDUP_INDEX_PATH') or None  # signature log shared by workers; unset = in memory
+app.config['DEDUP_REUSE_RESULTS'] = os.environ.get('DEDUP_REUSE_RESULTS', '0') == '1'  # default for ?reuse_duplicates
+app.config['SEARCH_INDEX_PATH'] = os.environ.get('SEARCH_INDEX_PATH') or None  # SQLite file behind /search; unset = disabled
+app.config['SEARCH_TOKEN'] = os.environ.get('SEARCH_TOKEN') or None  # when set, /search needs a matching X-Search-Token
+app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR') or None  # per-worker snapshots merged by /metrics
+app.config['PROFILE_ADMIN_TOKEN'] = os.environ.get('PROFILE_ADMIN_TOKEN') or None  # unset = profiling disabled
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR') or os.path.join(tempfile.gettempdir(), 'resume-parser-profiles')
+
+os.makedirs(app.config['SPOOL_DIR'], exist_ok=True)
+
+metrics = MetricsRegistry(app.config['METRICS_DIR'])
+metrics.describe('resume_parser_stage_duration_seconds', 'histogram', 'Time spent per parsing stage')
+metrics.describe('resume_parser_files_total', 'counter', 'Files processed by format and outcome')
+metrics.describe('resume_parser_bytes_total', 'counter', 'Upload bytes processed by format')
+metrics.describe('resume_parser_errors_total', 'counter', 'Failed files by error type')
+metrics.describe('resume_parser_budget_exceeded_total', 'counter', 'Files that ran out of their CPU or memory budget')
+metrics.describe('resume_parser_cache_events_total', 'counter', 'Result cache hits, misses, stores and evictions')
+metrics.describe('resume_parser_rejected_requests_total', 'counter', 'Requests turned away by endpoint concurrency limits')
+metrics.describe('resume_parser_queue_wait_seconds', 'histogram', 'Time requests waited for an endpoint slot')
+
+
+def file_format(filename):
+    """Metric label for a file's format"""
+    ext = filename.lower().rsplit('.', 1)[-1] if '.' in (filename or '') else ''
+    return ext if ext in ('pdf', 'docx', 'doc', 'txt') else 'other'
+
+
+def observe_result(result, size):
+    """Record counters and stage timings for one finished file"""
+    fmt = file_format(result.get('filename'))
+    metrics.inc('resume_parser_files_total', format=fmt, status='success' if result['success'] else 'error')
+    metrics.inc('resume_parser_bytes_total', size, format=fmt)
+    if not result['success']:
+        metrics.inc('resume_parser_errors_total', type=result.get('error_type', 'Unknown'))
+    if result.get('budget_exceeded'):
+        outcome = 'truncated' if result['success'] else 'failed'
+        metrics.inc('resume_parser_budget_exceeded_total', resource=result['budget_exceeded'], outcome=outcome)
+    for stage, ms in (result.get('timings') or {}).items():
+        metrics.observe('resume_parser_stage_duration_seconds', ms / 1000, stage=stage, format=fmt)
+
+
+def read_uploads(files):
+    """(filename, path, size, sha256) for every non-empty spooled upload, timing the hashing"""
+    start = time.perf_counter()
+    uploads = []
+    for f in files:
+        if not f or f.filename == '':
+            continue
+        f.stream.flush()
+        uploads.append((f.filename, f.stream.name) + hash_file(f.stream.name))
+    metrics.observe('resume_parser_stage_duration_seconds', time.perf_counter() - start, stage='upload_read', format='all')
+    return uploads
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """(size, sha256 hex digest) of a file, read in chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def upload_format(path):
+    """Sniffed format of a spooled upload (see resume_parser.sniff_format)"""
+    with open(path, 'rb') as f:
+        return sniff_format(f.read(4096))
+
+
+def oversized_result(filename, size):
+    """Error result for a file over MAX_FILE_SIZE, or None when it fits"""
+    limit = app.config['MAX_FILE_SIZE']
+    if size <= limit:
+        return None
+    return {
+        'filename': filename,
+        'success': False,
+        'error': f"File too large ({size} bytes). Maximum size per file is {limit // (1024 * 1024)}MB.",
+        'error_type': 'FileTooLarge'
+    }
+
+LIMITER_LATENCY_SAMPLES = 1000
+READY_MIN_LATENCY_SAMPLES = 20  # fewer recent requests do not make a p95 worth failing on
+
+
+class ConcurrencyLimiter:
+    """Caps how many requests an endpoint serves at once.
+    
+    Requests over ``max_active`` wait for a slot; once ``max_queued`` are
+    already waiting, or no slot frees up within ``timeout`` seconds, they
+    are rejected so the worker's threads stay free for cheap endpoints.
+    """
+    
+    def __init__(self, name, max_active, max_queued, timeout):
+        self.name = name
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.active = 0
+        self.queued = 0
+        self.cond = threading.Condition()
+        # (monotonic finish time, seconds) of recently served requests, for /ready
+        self.latencies = deque(maxlen=LIMITER_LATENCY_SAMPLES)
+    
+    def acquire(self):
+        """Take a slot, waiting in the queue if needed; False when rejected"""
+        if self.max_active <= 0:
+            return True
+        
+        start = time.perf_counter()
+        with self.cond:
+            if self.active >= self.max_active:
+                if self.queued >= self.max_queued:
+                    return False
+                self.queued += 1
+                try:
+                    ready = self.cond.wait_for(lambda: self.active < self.max_active, self.timeout)
+                finally:
+                    self.queued -= 1
+                if not ready:
+                    return False
+            self.active += 1
+        metrics.observe('resume_parser_queue_wait_seconds', time.perf_counter() - start, endpoint=self.name)
+        return True
+    
+    def release(self, started=None):
+        """Free a slot; ``started`` (perf_counter when the request arrived) records its latency"""
+        with self.cond:
+            if started is not None:
+                self.latencies.append((time.monotonic(), time.perf_counter() - started))
+            if self.max_active > 0:
+                self.active -= 1
+                self.cond.notify()
+    
+    def recent_p95(self, window):
+        """(p95 seconds or None, sample count) over requests that finished in the last ``window`` seconds"""
+        cutoff = time.monotonic() - window
+        with self.cond:
+            samples = sorted(seconds for finished, seconds in self.latencies if finished >= cutoff)
+        if not samples:
+            return None, 0
+        return samples[max(math.ceil(len(samples) * 0.95) - 1, 0)], len(samples)
+
+
+def limit_concurrency(limiter):
+    """Run a view under a ConcurrencyLimiter, answering 503 when it is saturated.
+    
+    The slot is held until the response is closed, so streamed responses
+    count against the limit while they are still being generated.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(*args, **kwargs):
+            started = time.perf_counter()
+            if not limiter.acquire():
+                metrics.inc('resume_parser_rejected_requests_total', endpoint=limiter.name)
+                logger.warning(f"Rejected {limiter.name} request: {limiter.active} active, {limiter.queued} queued")
+                response = jsonify({'error': 'Server is busy, retry later'})
+                response.headers['Retry-After'] = '5'
+                return response, 503
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except BaseException:
+                limiter.release(started)
+                raise
+            response.call_on_close(lambda: limiter.release(started))
+            return response
+        return wrapped
+    return decorator
+
+
+parse_limiter = ConcurrencyLimiter(
+    'parse', app.config['PARSE_MAX_CONCURRENT'], app.config['PARSE_MAX_QUEUED'], app.config['QUEUE_WAIT_TIMEOUT']
+)
+jobs_limiter = ConcurrencyLimiter(
+    'jobs', app.config['JOBS_MAX_CONCURRENT'], app.config['JOBS_MAX_QUEUED'], app.config['QUEUE_WAIT_TIMEOUT']
+)
 
 @app.route('/')
 def home():
@@ -179,9 +405,22 @@ def home():
                     formData.append('files', files[i]);
                 }
                 
+                // One placeholder per file, filled in as its line arrives
+                let html = '<h3>📊 Parsing Results:</h3>';
+                for (let i = 0; i < files.length; i++) {
+                    html += `
+                        <div class="result" id="result-${i}">
+                            <h4>⏳ ${escapeHtml(files[i].name)}</h4>
+                            <p>Waiting...</p>
+                        </div>
+                    `;
+                }
+                results.innerHTML = html;
+                
                 try {
                     const response = await fetch('/parse', {
                         method: 'POST',
+                        headers: { 'Accept': 'application/x-ndjson' },
                         body: formData
                     });
                     
@@ -189,11 +428,26 @@ def home():
                         throw new Error(`Server error: ${response.status}`);
                     }
                     
-                    const data = await response.json();
-                    displayResults(data);
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    
+                    while (true) {
+                        const { done, value } = await reader.read();
+                        if (done) break;
+                        
+                        buffer += decoder.decode(value, { stream: true });
+                        const lines = buffer.split('\\n');
+                        buffer = lines.pop();
+                        lines.filter(line => line.trim()).forEach(line => displayResult(JSON.parse(line)));
+                    }
+                    
+                    if (buffer.trim()) {
+                        displayResult(JSON.parse(buffer));
+                    }
                 } catch (error) {
                     console.error('Error:', error);
-                    results.innerHTML = `
+                    results.innerHTML += `
                         <div class="result error">
                             <h4>❌ Error</h4>
                             <p style="color: #e74c3c;">Failed to process files: ${error.message}</p>
@@ -207,35 +461,26 @@ def home():
                 }
             };
             
-            function displayResults(results) {
-                let html = '<h3>📊 Parsing Results:</h3>';
+            function displayResult(result) {
+                const div = document.getElementById(`result-${result.index}`);
+                if (!div) return;
                 
-                if (!results || results.length === 0) {
-                    html += '<p>No results to display.</p>';
+                if (result.success) {
+                    div.className = 'result';
+                    div.innerHTML = `
+                        <h4>✅ ${escapeHtml(result.filename)}</h4>
+                        <p><strong>👤 Name:</strong> ${escapeHtml(result.data.name)}</p>
+                        <p><strong>📧 Email:</strong> ${escapeHtml(result.data.email)}</p>
+                        <p><strong>📱 Phone:</strong> ${escapeHtml(result.data.phone)}</p>
+                        <p><strong>🛠️ Skills:</strong> ${result.data.skills.map(s => escapeHtml(s)).join(', ')}</p>
+                    `;
                 } else {
-                    results.forEach(result => {
-                        if (result.success) {
-                            html += `
-                                <div class="result">
-                                    <h4>✅ ${escapeHtml(result.filename)}</h4>
-                                    <p><strong>👤 Name:</strong> ${escapeHtml(result.data.name)}</p>
-                                    <p><strong>📧 Email:</strong> ${escapeHtml(result.data.email)}</p>
-                                    <p><strong>📱 Phone:</strong> ${escapeHtml(result.data.phone)}</p>
-                                    <p><strong>🛠️ Skills:</strong> ${result.data.skills.map(s => escapeHtml(s)).join(', ')}</p>
-                                </div>
-                            `;
-                        } else {
-                            html += `
-                                <div class="result error">
-                                    <h4>❌ ${escapeHtml(result.filename)}</h4>
-                                    <p style="color: #e74c3c;">${escapeHtml(result.error)}</p>
-                                </div>
-                            `;
-                        }
-                    });
+                    div.className = 'result error';
+                    div.innerHTML = `
+                        <h4>❌ ${escapeHtml(result.filename)}</h4>
+                        <p style="color: #e74c3c;">${escapeHtml(result.error)}</p>
+                    `;
                 }
-                
-                document.getElementById('results').innerHTML = html;
             }
             
             function escapeHtml(text) {
@@ -250,11 +495,57 @@ def home():
 
 @app.route('/health')
 def health():
-    """Health check endpoint for Railway"""
-    logger.info("Health check accessed")
+    """Liveness check for Railway; probed constantly, so it neither logs nor looks at load"""
+    if _worker_warming.is_set():
+        return {'status': 'warming', 'service': 'resume-parser'}, 503
     return {'status': 'healthy', 'service': 'resume-parser'}, 200
 
+@app.route('/ready')
+def ready():
+    """Readiness for autoscaling: this worker's live load, 503 while any READY_MAX_* threshold is exceeded"""
+    with _load_lock:
+        in_flight, pool_tasks = _parses_in_flight, _pool_tasks
+    queued = parse_limiter.queued + jobs_limiter.queued
+    p95, samples = parse_limiter.recent_p95(app.config['READY_LATENCY_WINDOW'])
+    pool_size = app.config['PARSE_POOL_SIZE']
+    utilization = pool_tasks / pool_size if pool_size > 0 else None
+    
+    failing = []
+    if _worker_warming.is_set():
+        failing.append('warming')
+    checks = (
+        ('in_flight', in_flight, app.config['READY_MAX_IN_FLIGHT']),
+        ('queued', queued, app.config['READY_MAX_QUEUED']),
+        ('p95', p95 if samples >= READY_MIN_LATENCY_SAMPLES else None, app.config['READY_MAX_P95']),
+        ('pool_utilization', utilization, app.config['READY_MAX_POOL_UTILIZATION']),
+    )
+    for name, value, limit in checks:
+        if limit > 0 and value is not None and value > limit:
+            failing.append(name)
+    
+    return {
+        'status': 'not ready' if failing else 'ready',
+        'failing': failing,
+        'in_flight': in_flight,
+        'active_requests': {'parse': parse_limiter.active, 'jobs': jobs_limiter.active},
+        'queued': queued,
+        'pending_job_files': _jobs_pending_files,
+        'p95_seconds': round(p95, 3) if p95 is not None else None,
+        'latency_samples': samples,
+        'pool': {
+            'size': pool_size,
+            'tasks': pool_tasks,
+            'utilization': round(utilization, 2) if utilization is not None else None
+        }
+    }, 503 if failing else 200
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint, summed across workers when METRICS_DIR is set"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/parse', methods=['POST'])
+@limit_concurrency(parse_limiter)
 def parse_resumes():
     """Parse uploaded resume files"""
     try:
@@ -269,393 +560,643 @@ def parse_resumes():
             logger.warning("Empty file list")
             return jsonify({'error': 'No files selected'}), 400
         
-        results = []
-        logger.info(f"Processing {len(files)} files")
+        uploads = read_uploads(files)
+        logger.info(f"Processing {len(uploads)} files")
         
-        for file in files:
-            try:
-                if not file or file.filename == '':
-                    continue
-                    
-                logger.info(f"Processing file: {file.filename}")
-                
-                # Read file content with format-specific handling
-                content = ''
-                file_ext = file.filename.lower().split('.')[-1] if '.' in file.filename else ''
-                
-                try:
-                    if file_ext == 'docx':
-                        content = extract_docx_text(file)
-                    elif file_ext == 'pdf':
-                        content = extract_pdf_text(file)
-                    else:
-                        # Handle text files - KEEP ORIGINAL LOGIC
-                        try:
-                            content = file.read().decode('utf-8')
-                        except UnicodeDecodeError:
-                            file.seek(0)
-                            try:
-                                content = file.read().decode('latin-1')
-                            except UnicodeDecodeError:
-                                file.seek(0)
-                                content = file.read().decode('utf-8', errors='ignore')
-                except Exception as e:
-                    logger.warning(f"File reading error for {file.filename}: {str(e)}")
-                    file.seek(0)
-                    content = file.read().decode('utf-8', errors='ignore')
-                
-                if not content.strip():
-                    raise ValueError("File appears to be empty or unreadable")
-                
-                # KEEP ORIGINAL PARSING LOGIC
-                parsed_data = parse_resume_content(content)
-                
-                results.append({
-                    'filename': file.filename,
-                    'success': True,
-                    'data': parsed_data
-                })
-                
-                logger.info(f"Successfully processed: {file.filename}")
-                
-            except Exception as e:
-                logger.error(f"Error processing {file.filename}: {str(e)}")
-                results.append({
-                    'filename': file.filename if file else 'unknown',
-                    'success': False,
-                    'error': f"Processing error: {str(e)}"
-                })
+        if wants_profile():
+            return profile_uploads(uploads)
+        
+        if wants_stream():
+            return stream_uploads(uploads, wants_reuse())
+        
+        results = process_uploads(uploads, reuse=wants_reuse())
         
         logger.info(f"Completed processing. {len([r for r in results if r['success']])} successful, {len([r for r in results if not r['success']])} failed")
-        return jsonify(results)
+        start = time.perf_counter()
+        response = jsonify(results)
+        metrics.observe('resume_parser_stage_duration_seconds', time.perf_counter() - start, stage='serialize', format='all')
+        response.headers['X-Cache-Hits'] = str(len([r for r in results if r.get('cached')]))
+        response.headers['X-Cache-Misses'] = str(len([r for r in results if r.get('cached') is False]))
+        return response
         
     except Exception as e:
         logger.error(f"Parse endpoint error: {str(e)}")
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
-def extract_pdf_text(file):
-    """Extract text from PDF file"""
-    try:
-        if not PyPDF2:
-            # Fallback to binary reading if PyPDF2 not available
-            file.seek(0)
-            raw_content = file.read()
-            return raw_content.decode('utf-8', errors='ignore')
-            
-        file.seek(0)
-        
-        # Use PyPDF2 to extract text
-        pdf_reader = PyPDF2.PdfReader(file)
-        text_content = []
-        
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_content.append(page_text)
-        
-        return '\n'.join(text_content)
-                
-    except Exception as e:
-        logger.warning(f"PDF extraction failed: {str(e)}")
-        # Fallback to treating as binary
-        file.seek(0)
-        raw_content = file.read()
-        return raw_content.decode('utf-8', errors='ignore')
-
-def extract_docx_text(file):
-    """Extract text from DOCX file - MINIMAL ADDITION ONLY"""
-    try:
-        if not zipfile:
-            # Fallback to binary reading if zipfile not available
-            file.seek(0)
-            raw_content = file.read()
-            return raw_content.decode('utf-8', errors='ignore')
-            
-        file.seek(0)
-        file_content = file.read()
-        
-        # DOCX files are ZIP archives
-        with zipfile.ZipFile(io.BytesIO(file_content), 'r') as zip_file:
-            # Extract the main document XML
-            xml_content = zip_file.read('word/document.xml')
-            
-            # Simple regex extraction - avoid complex XML parsing
-            import re
-            text_pattern = r'<w:t[^>]*>(.*?)</w:t>'
-            matches = re.findall(text_pattern, xml_content.decode('utf-8'), re.DOTALL)
-            return ' '.join(matches)
-                
-    except Exception as e:
-        logger.warning(f"DOCX extraction failed: {str(e)}")
-        # Fallback to treating as binary
-        file.seek(0)
-        raw_content = file.read()
-        return raw_content.decode('utf-8', errors='ignore')
-
-def parse_resume_content(content):
-    """ORIGINAL parsing function with ONLY Indian phone formats added"""
-    
-    # Clean content - ORIGINAL LOGIC
-    content = content.replace('\r\n', '\n').replace('\r', '\n')
-    lines = [line.strip() for line in content.split('\n') if line.strip()]
-    content_lower = content.lower()
-    
-    # Extract email - ORIGINAL LOGIC
-    email_patterns = [
-        r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
-    ]
-    
-    email = 'Not found'
-    for pattern in email_patterns:
-        email_match = re.search(pattern, content)
-        if email_match:
-            email = email_match.group(0)
-            break
-    
-    # Extract phone - ORIGINAL LOGIC + Indian formats
-    phone_patterns = [
-        # Indian formats - ONLY ADDITION
-        r'\+91[-.\s]?\d{10}',  # +91-9876543210
-        r'\+91[-.\s]?\d{5}[-.\s]?\d{5}',  # +91-98765-43210
-        r'91[-.\s]?\d{10}',  # 91-9876543210
-        r'\b[6-9]\d{9}\b',  # 9876543210 (Indian mobile)
-        r'\b[6-9]\d{4}[-.\s]?\d{5}\b',  # 98765-43210
-        # Original patterns
-        r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
-        r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',
-        r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\b\d{10}\b'
-    ]
-    
-    phone = 'Not found'
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, content)
-        if phone_match:
-            phone = phone_match.group(0)
-            break
-    
-    # Extract skills - ORIGINAL LOGIC (with VLSI & Embedded)
-    skill_keywords = [
-        'python', 'javascript', 'java', 'react', 'node', 'nodejs', 'sql', 'html', 'css',
-        'angular', 'vue', 'django', 'flask', 'spring', 'mongodb', 'postgresql', 'mysql',
-        'aws', 'azure', 'docker', 'kubernetes', 'git', 'linux', 'windows', 'macos',
-        'php', 'ruby', 'go', 'rust', 'c++', 'c#', 'swift', 'kotlin', 'typescript',
-        'bootstrap', 'tailwind', 'sass', 'less', 'webpack', 'babel', 'npm', 'yarn',
-        'redux', 'graphql', 'rest', 'api', 'microservices', 'devops', 'ci/cd',
-        'machine learning', 'ai', 'data science', 'pandas', 'numpy', 'tensorflow',
-        'pytorch', 'scikit-learn', 'jupyter', 'tableau', 'power bi', 'excel',
-        # VLSI & Hardware Design
-        'vlsi', 'verilog', 'vhdl', 'systemverilog', 'fpga', 'asic', 'rtl', 'synthesis',
-        'place and route', 'dft', 'sta', 'timing analysis', 'power analysis', 'spice',
-        'cadence', 'synopsys', 'mentor graphics', 'xilinx', 'altera', 'intel fpga',
-        'vivado', 'quartus', 'modelsim', 'questasim', 'ncverilog', 'vcs',
-        'design compiler', 'primetime', 'icc', 'encounter', 'innovus',
-        # Embedded Systems
-        'embedded', 'microcontroller', 'microprocessor', 'arm', 'cortex', 'risc-v',
-        'arduino', 'raspberry pi', 'stm32', 'pic', 'avr', 'esp32', 'esp8266',
-        'rtos', 'freertos', 'embedded c', 'embedded linux', 'bootloader',
-        'i2c', 'spi', 'uart', 'can', 'usb', 'ethernet', 'wifi', 'bluetooth',
-        'pwm', 'adc', 'dac', 'gpio', 'interrupt', 'dma', 'timer',
-        'iot', 'sensor', 'actuator', 'pcb', 'schematic', 'altium', 'kicad',
-        'eagle', 'proteus', 'multisim', 'ltspice', 'pspice'
-    ]
-    
-    skills = []
-    for skill in skill_keywords:
-        if skill.lower() in content_lower:
-            skills.append(skill.title())
-    
-    # Remove duplicates and sort - ORIGINAL LOGIC
-    skills = sorted(list(set(skills)))
-    
-    # Extract name - ORIGINAL LOGIC
-    name = extract_name_from_content(lines, content)
+class ResultCache(TieredCache):
+    """Parsed-result cache keyed by upload content hash.
+    
+    An in-process LRU bounded by total JSON size sits in front of an optional
+    SQLite store, which gunicorn workers on the same host can share.
+    """
+    
+    name = 'Result cache'
+    
+    def __init__(self, max_bytes, disk_path=None):
+        # Entries stay JSON text in memory: len() is their size and every hit decodes a fresh copy
+        super().__init__('results', max_bytes, disk_path)
+    
+    _weigh = staticmethod(len)
     
+    def _count(self, event):
+        # Caller holds self.lock
+        super()._count(event)
+        metrics.inc('resume_parser_cache_events_total', event=event)
+    
+    @staticmethod
+    def make_key(digest):
+        """Cache key for an upload's sha256 hex digest under the current parser and taxonomy"""
+        taxonomy_version = get_skill_matcher().version
+        return f"{PARSER_VERSION}:{taxonomy_version}:{digest}"
+    
+    def get(self, key):
+        """Return cached parsed data for a key, or None"""
+        value = super().get(key)
+        return None if value is None else json.loads(value)
+    
+    def put(self, key, data):
+        """Store parsed data under a key in both tiers"""
+        super().put(key, json.dumps(data))
+
+
+result_cache = ResultCache(app.config['RESULT_CACHE_MAX_BYTES'], app.config['RESULT_CACHE_PATH'])
+
+
+def cached_result(filename, key):
+    """Build a per-file result from the cache, or None on a miss"""
+    data = result_cache.get(key)
+    if data is None:
+        return None
     return {
-        'name': name,
-        'email': email,
-        'phone': phone,
-        'skills': skills if skills else ['Not specified']
+        'filename': filename,
+        'success': True,
+        'data': data,
+        'cached': True
     }
 
-def extract_name_from_content(lines, content):
-    """Enhanced name extraction with better patterns"""
+
+def store_result(key, result):
+    """Cache a freshly parsed result and mark it as a miss"""
+    result['cached'] = False
+    # A truncated parse depends on load (CPU budget), so the next upload gets a full try
+    if result['success'] and not result.get('truncated'):
+        result_cache.put(key, result['data'])
+    return result
+
+
+dedup_index = MinHashIndex(app.config['DEDUP_INDEX_PATH']) if app.config['DEDUP_ENABLED'] else None
+
+
+search_index = CandidateIndex(app.config['SEARCH_INDEX_PATH']) if app.config['SEARCH_INDEX_PATH'] else None
+
+
+def index_result(result):
+    """Make a freshly parsed result findable through /search"""
+    if search_index is None or not result['success'] or result.get('cached'):
+        return
+    try:
+        search_index.add(result['id'], result['filename'], result['data'])
+    except sqlite3.Error as e:
+        logger.warning(f"Search index write failed: {str(e)}")
+
+
+def flag_duplicates(result, digest, reuse=False):
+    """Index a fresh result's signature and list earlier near-duplicates under 'duplicates'.
     
-    # Skip common header words
-    skip_words = {
-        'resume', 'cv', 'curriculum', 'vitae', 'profile', 'summary', 'objective',
-        'experience', 'education', 'skills', 'contact', 'information', 'personal',
-        'details', 'phone', 'email', 'mobile', 'address', 'linkedin', 'github'
-    }
+    With ``reuse``, the data of the closest earlier duplicate still in the
+    result cache replaces the new parse, and 'reused_from' names it. Call
+    after store_result so the cache keeps this file's own parse.
+    """
+    signature = result.pop('signature', None)
+    if signature is None or dedup_index is None:
+        return result
     
-    # First try to find name patterns in the content
-    name_patterns = [
-        # Look for "Name:" or "Full Name:" labels
-        r'(?:Name|Full Name)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]*\.?)*\s+[A-Z][a-z]+)',
-        # Standard name patterns at line start
-        r'^([A-Z][a-z]{1,15}(?:\s+[A-Z][a-z]*\.?)*\s+[A-Z][a-z]{1,15})
+    matches = dedup_index.query(signature, exclude=digest)
+    dedup_index.add(digest, signature)
+    result['duplicates'] = [{'id': doc_id, 'similarity': similarity} for doc_id, similarity in matches]
+    
+    if reuse:
+        for doc_id, _ in matches:
+            data = result_cache.get(ResultCache.make_key(doc_id))
+            if data is not None:
+                result['data'] = data
+                result['reused_from'] = doc_id
+                break
+    return result
 
-@app.errorhandler(413)
-def too_large(e):
-    logger.warning("File too large uploaded")
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
 
-@app.errorhandler(500)
-def internal_error(e):
-    logger.error(f"Internal server error: {str(e)}")
-    return jsonify({'error': 'Internal server error'}), 500
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_ENV') == 'development'
+
+def get_parse_pool():
+    """Return the shared process pool for file parsing, or None when disabled"""
+    global _parse_pool
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug),
-        # Name with middle initial
-        r'^([A-Z][a-z]{1,15}\s+[A-Z]\.\s+[A-Z][a-z]{1,15})
+    if app.config['PARSE_POOL_SIZE'] <= 0:
+        return None
+    
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=app.config['PARSE_POOL_SIZE'], initializer=limit_worker_memory
+            )
+        return _parse_pool
 
-@app.errorhandler(413)
-def too_large(e):
-    logger.warning("File too large uploaded")
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
 
-@app.errorhandler(500)
-def internal_error(e):
-    logger.error(f"Internal server error: {str(e)}")
-    return jsonify({'error': 'Internal server error'}), 500
+_parses_in_flight = 0
+_pool_tasks = 0
+_load_lock = threading.Lock()
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_ENV') == 'development'
+
+def _count_parse(pooled, delta):
+    global _parses_in_flight, _pool_tasks
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug),
-        # Three part names
-        r'^([A-Z][a-z]{1,15}\s+[A-Z][a-z]{1,15}\s+[A-Z][a-z]{1,15})
+    with _load_lock:
+        _parses_in_flight += delta
+        if pooled:
+            _pool_tasks += delta
 
-@app.errorhandler(413)
-def too_large(e):
-    logger.warning("File too large uploaded")
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
 
-@app.errorhandler(500)
-def internal_error(e):
-    logger.error(f"Internal server error: {str(e)}")
-    return jsonify({'error': 'Internal server error'}), 500
+def submit_parse(executor, *args):
+    """Submit process_resume_path to an executor, counting the file as in flight until it finishes"""
+    pooled = isinstance(executor, ProcessPoolExecutor)
+    _count_parse(pooled, 1)
+    try:
+        future = executor.submit(process_resume_path, *args)
+    except BaseException:
+        _count_parse(pooled, -1)
+        raise
+    future.add_done_callback(lambda _: _count_parse(pooled, -1))
+    return future
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_ENV') == 'development'
+
+def parse_inline(*args):
+    """process_resume_path in the calling thread, counted as in flight"""
+    _count_parse(False, 1)
+    try:
+        return process_resume_path(*args)
+    finally:
+        _count_parse(False, -1)
+
+
+_worker_warming = threading.Event()
+
+
+def warm_up_worker():
+    """Start this worker's parse pool in the background; /health reports 'warming' until it is up.
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug)
-    ]
-    
-    # Search in the full content first for labeled names
-    for pattern in name_patterns[:1]:  # Only the labeled pattern
-        match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
-        if match:
-            potential_name = match.group(1).strip()
-            if validate_name(potential_name):
-                return potential_name
-    
-    # Then search line by line for names at the beginning
-    for i, line in enumerate(lines[:20]):  # Check first 20 lines
-        line_clean = line.strip()
+    Called from gunicorn's post_worker_init hook. The pool processes fork
+    from the worker, so with --preload they inherit the state warm_up built
+    in the master too.
+    """
+    pool = get_parse_pool()
+    if pool is None:
+        return
+    _worker_warming.set()
+    
+    def start_processes():
+        try:
+            # Each submit forks another process until the pool is full
+            futures = [pool.submit(os.getpid) for _ in range(app.config['PARSE_POOL_SIZE'])]
+            done, _ = wait(futures, timeout=app.config['PARSE_FILE_TIMEOUT'])
+            logger.info(f"Parse pool ready with {len({future.result() for future in done})} processes")
+        except BrokenProcessPool as e:
+            logger.error(f"Parse pool failed to start: {str(e)}")
+            reset_parse_pool()
+        finally:
+            _worker_warming.clear()
+    
+    threading.Thread(target=start_processes, name='pool-warm-up', daemon=True).start()
+
+
+def reset_parse_pool():
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _parse_pool
+    
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+def process_uploads(uploads, inline=False, reuse=False):
+    """Parse spooled uploads on the process pool, keeping upload order"""
+    results = [None] * len(uploads)
+    for index, result in iter_processed_uploads(uploads, inline, reuse):
+        results[index] = result
+    return results
+
+
+def iter_processed_uploads(uploads, inline=False, reuse=False):
+    """Yield (index, result) for each upload as soon as it has been parsed.
+    
+    ``inline`` skips the result cache and the pool so all work happens in
+    the calling thread (used when profiling a request).
+    """
+    for index, result in _iter_parsed_uploads(uploads, inline, reuse):
+        # The upload's sha256 is its id, also used to name near-duplicates
+        result['id'] = uploads[index][3]
+        observe_result(result, uploads[index][2])
+        index_result(result)
+        yield index, result
+
+
+def _iter_parsed_uploads(uploads, inline, reuse):
+    signature = dedup_index is not None
+    keys = [ResultCache.make_key(digest) for _, _, _, digest in uploads]
+    misses = []
+    for index, ((filename, _, size, _), key) in enumerate(zip(uploads, keys)):
+        result = oversized_result(filename, size)
+        if result is None and not inline:
+            result = cached_result(filename, key)
+        if result is None:
+            misses.append(index)
+        else:
+            yield index, result
+    
+    # Under threaded serving an in-thread parse holds the GIL, so only a single small file skips the pool.
+    # Only plain text: the CPU timer that stops a runaway PDF/DOC(X) extractor needs a pool process's main thread.
+    small = (len(misses) == 1 and uploads[misses[0]][2] <= app.config['INLINE_PARSE_MAX_BYTES']
+             and upload_format(uploads[misses[0]][1]) == 'text')
+    pool = get_parse_pool() if misses and not small and not inline else None
+    futures = {}
+    if pool is not None:
+        try:
+            # Only the spool path crosses the process boundary; the worker maps the file itself
+            futures = {submit_parse(pool, *uploads[i][:2], signature): i for i in misses}
+        except BrokenProcessPool:
+            reset_parse_pool()
+            futures = {}
+    
+    if not futures:
+        for i in misses:
+            result = store_result(keys[i], parse_inline(*uploads[i][:2], signature))
+            yield i, flag_duplicates(result, uploads[i][3], reuse)
+        return
+    
+    timeout = app.config['PARSE_FILE_TIMEOUT']
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
         
-        # Skip very short or very long lines
-        if len(line_clean) < 3 or len(line_clean) > 80:
-            continue
-            
-        # Skip lines with common resume headers
-        if any(word in line_clean.lower() for word in skip_words):
-            continue
-            
-        # Skip lines with @ or many numbers or special chars
-        if '@' in line_clean or re.search(r'\d{3,}', line_clean) or line_clean.count('.') > 2:
-            continue
+        if not done:
+            # Nothing finished within the timeout; the workers keep running but we stop waiting
+            for future in pending:
+                future.cancel()
+                filename = uploads[futures[future]][0]
+                logger.error(f"Timed out processing {filename} after {timeout}s")
+                yield futures[future], {
+                    'filename': filename,
+                    'success': False,
+                    'error': f"Processing error: timed out after {timeout}s",
+                    'error_type': 'Timeout'
+                }
+            return
         
-        # Skip lines that are mostly uppercase (likely headers)
-        if line_clean.isupper() and len(line_clean) > 8:
+        for future in done:
+            i = futures[future]
+            filename = uploads[i][0]
+            try:
+                result = store_result(keys[i], future.result())
+                yield i, flag_duplicates(result, uploads[i][3], reuse)
+            except BrokenProcessPool as e:
+                reset_parse_pool()
+                logger.error(f"Worker pool failed while processing {filename}: {str(e)}")
+                yield i, {
+                    'filename': filename,
+                    'success': False,
+                    'error': "Processing error: worker process crashed",
+                    'error_type': 'WorkerCrash'
+                }
+
+
+def wants_profile():
+    """True when the client asked for this request to be profiled"""
+    return bool(request.headers.get('X-Profile') or request.args.get('profile'))
+
+
+def is_admin():
+    """Constant-time check of the admin token; always False when none is configured"""
+    token = app.config['PROFILE_ADMIN_TOKEN']
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def profile_uploads(uploads):
+    """Parse inline under a profiler and store the artifact for this request only"""
+    if not is_admin():
+        logger.warning("Rejected profiling request without a valid admin token")
+        return jsonify({'error': 'Profiling requires a valid X-Admin-Token'}), 403
+    
+    mode = (request.headers.get('X-Profile') or request.args.get('profile') or '').lower()
+    mode = mode if mode in PROFILE_MODES else 'pstats'
+    
+    results, profile_id, path, seconds = profile_call(
+        mode, app.config['PROFILE_DIR'], process_uploads, uploads, inline=True
+    )
+    logger.info(f"Profiled parse of {len(uploads)} files in {seconds:.3f}s ({mode}): {path}")
+    
+    response = jsonify(results)
+    response.headers['X-Profile-Id'] = profile_id
+    response.headers['X-Profile-Url'] = f'/profiles/{profile_id}'
+    return response
+
+
+@app.route('/profiles/<profile_id>')
+def download_profile(profile_id):
+    """Download a stored profile artifact (admin only)"""
+    if not is_admin():
+        return jsonify({'error': 'Forbidden'}), 403
+    path = find_profile(app.config['PROFILE_DIR'], profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+
+
+def wants_reuse():
+    """True when near-duplicates of earlier uploads should return the earlier parse"""
+    value = request.args.get('reuse_duplicates')
+    if value is None:
+        return app.config['DEDUP_REUSE_RESULTS']
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def wants_stream():
+    """True when the client opted into NDJSON streaming for /parse"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+
+def stream_uploads(uploads, reuse=False):
+    """NDJSON response with one line per file, written as each file finishes"""
+    def generate():
+        succeeded = 0
+        for index, result in iter_processed_uploads(uploads, reuse=reuse):
+            result['index'] = index
+            succeeded += 1 if result['success'] else 0
+            start = time.perf_counter()
+            line = json.dumps(result) + '\n'
+            metrics.observe('resume_parser_stage_duration_seconds', time.perf_counter() - start, stage='serialize', format='all')
+            yield line
+        logger.info(f"Completed streaming. {succeeded} successful, {len(uploads) - succeeded} failed")
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+# Job progress lives in SQLite so a status poll can land on any worker; the queue below is this worker's
+job_store = JobStore(app.config['JOB_STORE_PATH'])
+_jobs_lock = threading.Lock()
+_jobs_pending_files = 0
+_job_thread_pool = None
+# Job files waiting for the pool. Only JOB_FILES_IN_FLIGHT of them sit in the pool's
+# FIFO queue at a time, so a large job cannot put /parse requests behind all its files.
+_job_files = deque()
+_job_files_in_flight = 0
+_job_finisher = None
+
+
+def get_job_executor():
+    """Executor for background jobs: the parse pool, or a thread when it is disabled"""
+    global _job_thread_pool
+    
+    pool = get_parse_pool()
+    if pool is not None:
+        return pool
+    
+    with _jobs_lock:
+        if _job_thread_pool is None:
+            _job_thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='parse-job')
+        return _job_thread_pool
+
+
+def get_job_finisher():
+    """Thread that stores finished job files, off the pool's result-handling thread"""
+    global _job_finisher
+    
+    with _jobs_lock:
+        if _job_finisher is None:
+            _job_finisher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-finish')
+        return _job_finisher
+
+
+def expire_jobs():
+    """Forget finished jobs older than JOB_TTL"""
+    job_store.expire(time.time() - app.config['JOB_TTL'])
+
+
+def keep_upload(path):
+    """Give a spooled upload a second name so it outlives the request that created it"""
+    job_path = f"{path}.job"
+    try:
+        os.link(path, job_path)
+    except OSError:
+        shutil.copyfile(path, job_path)
+    return job_path
+
+
+def submit_job(uploads, reuse=False):
+    """Queue spooled uploads as a background job; returns its id, or None when the queue is full"""
+    global _jobs_pending_files
+    
+    expire_jobs()
+    
+    with _jobs_lock:
+        if _jobs_pending_files + len(uploads) > app.config['JOB_QUEUE_MAX_FILES']:
+            return None
+        _jobs_pending_files += len(uploads)
+    try:
+        job_id = job_store.create(len(uploads))
+    except sqlite3.Error:
+        with _jobs_lock:
+            _jobs_pending_files -= len(uploads)
+        raise
+    
+    for index, (filename, path, size, digest) in enumerate(uploads):
+        key = ResultCache.make_key(digest)
+        result = oversized_result(filename, size) or cached_result(filename, key)
+        if result is not None:
+            with _jobs_lock:
+                _jobs_pending_files -= 1
+            result['id'] = digest
+            observe_result(result, size)
+            job_store.record(job_id, index, result)
             continue
-            
-        # Try name patterns on this line
-        for pattern in name_patterns[1:]:  # Skip the labeled pattern
-            match = re.match(pattern, line_clean)
-            if match:
-                potential_name = match.group(1).strip()
-                if validate_name(potential_name):
-                    return potential_name
-    
-    # Last resort: look for any two capitalized words together
-    capitalized_words = re.findall(r'\b[A-Z][a-z]{2,15}\b', content)
-    if len(capitalized_words) >= 2:
-        for i in range(len(capitalized_words) - 1):
-            potential_name = f"{capitalized_words[i]} {capitalized_words[i+1]}"
-            if validate_name(potential_name):
-                # Check it's not a common phrase
-                name_lower = potential_name.lower()
-                if not any(skip in name_lower for skip in skip_words):
-                    return potential_name
-    
-    return 'Not found'
-
-def validate_name(name):
-    """Enhanced name validation"""
-    if not name or len(name.split()) < 2:
-        return False
         
-    parts = name.split()
-    
-    # Should have 2-4 parts
-    if len(parts) < 2 or len(parts) > 4:
-        return False
-    
-    # Check each part
-    for part in parts:
-        # Should be reasonable length
-        if len(part) < 2 or len(part) > 20:
-            return False
-        # Should start with capital
-        if not part[0].isupper():
-            return False
-        # Should be mostly letters (allow . for middle initials)
-        if not re.match(r'^[A-Za-z\.\']+
+        # The request's temp file is deleted once the response is sent
+        job_path = keep_upload(path)
+        with _jobs_lock:
+            _job_files.append((job_id, index, (filename, job_path, size, digest), key, reuse))
+    
+    feed_job_files()
+    return job_id
 
-@app.errorhandler(413)
-def too_large(e):
-    logger.warning("File too large uploaded")
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
 
-@app.errorhandler(500)
-def internal_error(e):
-    logger.error(f"Internal server error: {str(e)}")
-    return jsonify({'error': 'Internal server error'}), 500
+def feed_job_files():
+    """Hand queued job files to the executor until JOB_FILES_IN_FLIGHT are in it"""
+    global _job_files_in_flight
+    
+    signature = dedup_index is not None
+    while True:
+        with _jobs_lock:
+            if not _job_files or _job_files_in_flight >= max(app.config['JOB_FILES_IN_FLIGHT'], 1):
+                return
+            item = _job_files.popleft()
+            _job_files_in_flight += 1
+        
+        filename, path = item[2][:2]
+        try:
+            try:
+                future = submit_parse(get_job_executor(), filename, path, signature)
+            except BrokenProcessPool:
+                reset_parse_pool()
+                future = submit_parse(get_job_executor(), filename, path, signature)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        # Done-callbacks run on the pool's result-handling thread; keep them to a hand-off
+        future.add_done_callback(lambda f, item=item: get_job_finisher().submit(_finish_job_file, *item, f))
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_ENV') == 'development'
+
+def _finish_job_file(job_id, index, upload, key, reuse, future):
+    global _jobs_pending_files, _job_files_in_flight
     
-    logger.info(f"Starting Flask app on port {port}")
-    app.run(host='0.0.0.0', port=port, debug=debug), part):
-            return False
-        # Avoid common non-name words
-        if part.lower() in ['resume', 'email', 'phone', 'contact', 'address', 'skills']:
-            return False
+    with _jobs_lock:
+        _job_files_in_flight -= 1
+    feed_job_files()
+    
+    filename, path, size, digest = upload
+    try:
+        os.unlink(path)
+    except OSError as e:
+        logger.warning(f"Could not remove spooled upload {path}: {str(e)}")
+    
+    try:
+        result = flag_duplicates(store_result(key, future.result()), digest, reuse)
+    except Exception as e:
+        logger.error(f"Job {job_id} failed on {filename}: {str(e)}")
+        result = {
+            'filename': filename,
+            'success': False,
+            'error': f"Processing error: {str(e)}",
+            'error_type': type(e).__name__
+        }
+    
+    result['id'] = digest
+    with _jobs_lock:
+        _jobs_pending_files -= 1
+    observe_result(result, size)
+    index_result(result)
+    try:
+        job_store.record(job_id, index, result)
+    except sqlite3.Error as e:
+        logger.error(f"Could not store the result of {filename} for job {job_id}: {str(e)}")
+
+
+@app.route('/jobs', methods=['POST'])
+@limit_concurrency(jobs_limiter)
+def create_job():
+    """Accept a batch of resume files for background parsing"""
+    if 'files' not in request.files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    uploads = read_uploads(request.files.getlist('files'))
+    if not uploads:
+        return jsonify({'error': 'No files selected'}), 400
+    
+    job_id = submit_job(uploads, wants_reuse())
+    if job_id is None:
+        logger.warning(f"Job queue full, rejecting batch of {len(uploads)} files")
+        response = jsonify({'error': 'Job queue is full, retry later'})
+        response.headers['Retry-After'] = '30'
+        return response, 429
     
-    return True
+    logger.info(f"Queued job {job_id} with {len(uploads)} files")
+    return jsonify({
+        'id': job_id,
+        'total': len(uploads),
+        'status_url': f'/jobs/{job_id}',
+        'results_url': f'/jobs/{job_id}/results'
+    }), 202
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Progress and partial results of a background job"""
+    status = job_store.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(status)
+
+
+@app.route('/jobs/<job_id>/results')
+def job_results(job_id):
+    """Stream a job's results as NDJSON, one line per file as it finishes"""
+    if not job_store.exists(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    def generate():
+        for result in job_store.iter_results(job_id):
+            yield json.dumps(result) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/search')
+def search_candidates():
+    """Find parsed resumes by boolean skill query, email or phone, newest first"""
+    if search_index is None:
+        return jsonify({'error': 'Search is disabled (set SEARCH_INDEX_PATH)'}), 404
+    
+    token = app.config['SEARCH_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('X-Search-Token', '').encode(), token.encode()):
+        return jsonify({'error': 'Search requires a valid X-Search-Token'}), 403
+    
+    skills = request.args.get('skills') or request.args.get('q')
+    email = request.args.get('email')
+    phone = request.args.get('phone')
+    if not (skills or email or phone):
+        return jsonify({'error': 'Provide skills, email or phone'}), 400
+    
+    try:
+        limit = int(request.args.get('limit', 20))
+        cursor = request.args.get('cursor')
+        if cursor is not None:
+            int(cursor)
+    except ValueError:
+        return jsonify({'error': 'limit and cursor must be integers'}), 400
+    
+    start = time.perf_counter()
+    try:
+        results, next_cursor = search_index.search(
+            skills, email, phone, limit, cursor, terms=get_skill_matcher().terms
+        )
+    except SearchQueryError as e:
+        return jsonify({'error': str(e)}), 400
+    metrics.observe('resume_parser_stage_duration_seconds', time.perf_counter() - start, stage='search', format='all')
+    
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'next_cursor': next_cursor
+    })
+
 
 @app.errorhandler(413)
 def too_large(e):
     logger.warning("File too large uploaded")
-    return jsonify({'error': 'File too large. Maximum size is 16MB.'}), 413
+    limit = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({'error': f'Request too large. Maximum upload size is {limit}MB.'}), 413
 
 @app.errorhandler(500)
 def internal_error(e):
     logger.error(f"Internal server error: {str(e)}")
     return jsonify({'error': 'Internal server error'}), 500
 
+if app.config['WARMUP_PARSES']:
+    # Under gunicorn --preload this runs once in the master, before any worker forks
+    warm_up()
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
@@ -0,0 +1 @@
+"""Benchmark harness and synthetic resume corpus for the parser"""
@@ -0,0 +1,81 @@
+"""Batch API benchmark: parse_many against parse_resume_content in a loop.
+
+Usage (from the resume-parser directory)::
+
+    python -m benchmarks.batch --docs 10000
+    python -m benchmarks.batch --docs 10000 --sizes medium
+
+Both paths parse the same decoded texts; the run fails if any column
+value differs from the single-document result.
+"""
+import argparse
+import json
+import sys
+import time
+
+from resume_parser import BATCH_FIELDS, decode_text, parse_many, parse_resume_content
+
+from .corpus import DENSITIES, SIZES, generate_corpus
+
+
+def build_texts(docs, seed, sizes, densities):
+    """`docs` decoded TXT resumes spread evenly over the size/density variants"""
+    per_variant = max(docs // (len(sizes) * len(densities)), 1)
+    corpus = generate_corpus(per_variant, seed, ['txt'], sizes, densities)
+    return [decode_text(raw) for _, raw, _ in corpus]
+
+
+def run_batch(texts, batch_size):
+    """(docs/s of the loop, docs/s of parse_many, number of differing documents)"""
+    start = time.perf_counter()
+    single = [parse_resume_content(text) for text in texts]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = {field: [] for field in BATCH_FIELDS}
+    for offset in range(0, len(texts), batch_size):
+        for field, values in parse_many(texts[offset:offset + batch_size]).items():
+            columns[field].extend(values)
+    batch_s = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for index, parsed in enumerate(single)
+        if any(parsed[field] != columns[field][index] for field in BATCH_FIELDS)
+    )
+    return len(texts) / loop_s, len(texts) / batch_s, mismatches
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Compare batch parsing with the single-document loop.')
+    parser.add_argument('--docs', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=10000, help='texts per parse_many call')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--densities', nargs='+', choices=list(DENSITIES), default=list(DENSITIES))
+    parser.add_argument('--save', help='write results JSON to this path')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    texts = build_texts(args.docs, args.seed, args.sizes, args.densities)
+    loop_rate, batch_rate, mismatches = run_batch(texts, args.batch_size)
+    report = {
+        'docs': len(texts),
+        'loop_docs_per_s': round(loop_rate, 1),
+        'batch_docs_per_s': round(batch_rate, 1),
+        'speedup': round(batch_rate / loop_rate, 2),
+        'mismatches': mismatches,
+    }
+    print(json.dumps(report))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if mismatches:
+        print(f'{mismatches} documents differ from parse_resume_content', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
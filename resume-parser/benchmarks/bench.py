@@ -0,0 +1,193 @@
+"""Parser benchmark: throughput, per-stage latency percentiles and peak RSS.
+
+Usage (from the resume-parser directory)::
+
+    python -m benchmarks.bench --save benchmarks/baseline.json
+    python -m benchmarks.bench --compare benchmarks/baseline.json
+
+Results are JSON so runs from different versions can be diffed; --compare
+prints the change per metric and exits non-zero when anything regressed by
+more than --threshold percent.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from resume_parser import PARSER_VERSION, chunks, process_resume_file
+
+from .corpus import DENSITIES, FORMATS, SIZES, generate_corpus
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize_stages(samples):
+    """{stage: [ms, ...]} -> {stage: {p50, p95, p99, mean}}"""
+    return {
+        stage: {
+            'p50': round(percentile(values, 50), 3),
+            'p95': round(percentile(values, 95), 3),
+            'p99': round(percentile(values, 99), 3),
+            'mean': round(sum(values) / len(values), 3),
+        }
+        for stage, values in sorted(samples.items())
+    }
+
+
+def timed_parse(filename, raw):
+    """Pool task: parse one document and add its wall time as the 'total' stage"""
+    start = time.perf_counter()
+    result = process_resume_file(filename, raw)
+    timings = dict(result.get('timings') or {})
+    timings['total'] = (time.perf_counter() - start) * 1000
+    return result['success'], timings
+
+
+def peak_rss_mb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(max(usage, children) / scale, 1)
+
+
+def run_benchmark(corpus, workers=0, repeat=1):
+    """Parse the corpus `repeat` times and return the metrics document"""
+    samples = {}
+    by_format = {}
+    failures = 0
+    total_bytes = sum(len(raw) for _, raw, _ in corpus) * repeat
+    
+    # With --repeat the chunk cache would serve every pass after the first, so runs
+    # with a different --repeat would not compare; pool processes fork with it off too
+    chunks.chunk_cache = None
+    
+    # Warm the skill index and regex caches outside the timed region
+    process_resume_file(corpus[0][0], corpus[0][1])
+    
+    jobs = [(name, raw, variant) for _ in range(repeat) for name, raw, variant in corpus]
+    start = time.perf_counter()
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(timed_parse, [j[0] for j in jobs], [j[1] for j in jobs], chunksize=4))
+    else:
+        outcomes = [timed_parse(name, raw) for name, raw, _ in jobs]
+    elapsed = time.perf_counter() - start
+    
+    for (_, _, variant), (success, timings) in zip(jobs, outcomes):
+        failures += 0 if success else 1
+        for stage, ms in timings.items():
+            samples.setdefault(stage, []).append(ms)
+            by_format.setdefault(variant['format'], {}).setdefault(stage, []).append(ms)
+    
+    return {
+        'docs': len(jobs),
+        'failures': failures,
+        'bytes': total_bytes,
+        'elapsed_s': round(elapsed, 4),
+        'docs_per_s': round(len(jobs) / elapsed, 2),
+        'mb_per_s': round(total_bytes / elapsed / (1024 * 1024), 3),
+        'peak_rss_mb': peak_rss_mb(),
+        'stages_ms': summarize_stages(samples),
+        'formats': {fmt: summarize_stages(stages) for fmt, stages in sorted(by_format.items())},
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print metric deltas; return the list of regressions beyond threshold percent"""
+    regressions = []
+    
+    def check(label, old, new, higher_is_better, noise_floor=0.0):
+        if not old:
+            return
+        change = (new - old) / old * 100
+        worse = -change if higher_is_better else change
+        # Sub-noise-floor differences on tiny stages are timer jitter, not regressions
+        significant = abs(new - old) >= noise_floor
+        flag = ' REGRESSION' if worse > threshold and significant else ''
+        print(f"{label:<32} {old:>12.3f} {new:>12.3f} {change:>+8.1f}%{flag}")
+        if flag:
+            regressions.append(label)
+    
+    print(f"{'metric':<32} {'baseline':>12} {'current':>12} {'change':>9}")
+    check('docs_per_s', baseline['docs_per_s'], current['docs_per_s'], True)
+    check('mb_per_s', baseline['mb_per_s'], current['mb_per_s'], True)
+    check('peak_rss_mb', baseline['peak_rss_mb'], current['peak_rss_mb'], False)
+    for stage, stats in current['stages_ms'].items():
+        old = baseline['stages_ms'].get(stage)
+        if old:
+            for key in ('p50', 'p95', 'p99'):
+                check(f'{stage}.{key}', old[key], stats[key], False, noise_floor=0.05)
+    return regressions
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Benchmark resume parsing on a synthetic corpus.')
+    parser.add_argument('--count', type=int, default=5, help='documents per format/size/density variant')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--densities', nargs='+', choices=list(DENSITIES), default=list(DENSITIES))
+    parser.add_argument('--repeat', type=int, default=1, help='passes over the corpus')
+    parser.add_argument('--workers', type=int, default=0, help='process pool size (0 = inline)')
+    parser.add_argument('--save', help='write results JSON to this path')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=10.0, help='regression threshold in percent')
+    parser.add_argument('--write-corpus', metavar='DIR', help='also write the corpus files to DIR')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    
+    corpus = list(generate_corpus(args.count, args.seed, args.formats, args.sizes, args.densities))
+    if args.write_corpus:
+        os.makedirs(args.write_corpus, exist_ok=True)
+        for name, raw, _ in corpus:
+            with open(os.path.join(args.write_corpus, name), 'wb') as f:
+                f.write(raw)
+    
+    metrics = run_benchmark(corpus, args.workers, args.repeat)
+    report = {
+        'parser_version': PARSER_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'count': args.count, 'seed': args.seed, 'formats': args.formats, 'sizes': args.sizes,
+            'densities': args.densities, 'repeat': args.repeat, 'workers': args.workers,
+        },
+        **metrics,
+    }
+    
+    print(json.dumps({k: report[k] for k in ('docs', 'failures', 'docs_per_s', 'mb_per_s', 'peak_rss_mb')}))
+    for stage, stats in report['stages_ms'].items():
+        print(f"  {stage:<16} p50 {stats['p50']:>9.3f}ms  p95 {stats['p95']:>9.3f}ms  p99 {stats['p99']:>9.3f}ms")
+    
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('config') != report['config']:
+            print('warning: baseline was recorded with a different corpus config', file=sys.stderr)
+        if compare(baseline, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+"""Deterministic synthetic resume corpus (TXT, DOCX, PDF, DOC).
+
+The same seed always produces byte-identical documents, so timings from
+different code versions are comparable.
+"""
+import io
+import random
+import struct
+import zipfile
+from xml.sax.saxutils import escape
+
+FIRST_NAMES = ['Priya', 'Rahul', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Meera', 'Karthik',
+               'John', 'Emily', 'Michael', 'Sarah', 'David', 'Laura', 'James', 'Olivia']
+LAST_NAMES = ['Sharma', 'Verma', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Patel', 'Rao',
+              'Smith', 'Johnson', 'Brown', 'Miller', 'Davis', 'Wilson', 'Taylor', 'Clark']
+SKILLS = ['Python', 'Java', 'Verilog', 'SystemVerilog', 'VHDL', 'FPGA', 'ASIC', 'RTL', 'UVM',
+          'Embedded C', 'ARM Cortex', 'FreeRTOS', 'STM32', 'I2C', 'SPI', 'UART', 'Docker',
+          'Kubernetes', 'AWS', 'React', 'Node', 'SQL', 'PostgreSQL', 'Machine Learning',
+          'TensorFlow', 'Git', 'Linux', 'Synopsys', 'Cadence', 'PrimeTime', 'Vivado']
+FILLER = ('designed implemented verified optimized delivered led maintained migrated the a '
+          'timing closure low power subsystem pipeline team customers release quality throughput '
+          'block level testbench coverage regression firmware driver board bring up').split()
+SECTIONS = ['Summary', 'Experience', 'Projects', 'Education', 'Certifications']
+PHONE_FORMATS = ['+91 {a}{b}', '+91-{a}-{b}', '{a}{b}', '({c}) {d}-{e}', '+1 {c} {d} {e}']
+
+FORMATS = ('txt', 'docx', 'pdf', 'doc')
+SIZES = {'small': 30, 'medium': 300, 'large': 3000}  # body lines
+DENSITIES = {'sparse': 0.02, 'dense': 0.3}  # chance a body word is a skill
+
+
+def generate_lines(rng, size_lines, skill_density):
+    """Resume text as a list of lines: contact header, then sectioned body"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}{rng.randint(1, 99)}@example.com"
+    digits = ''.join(str(rng.randint(0, 9)) for _ in range(10))
+    phone = rng.choice(PHONE_FORMATS).format(
+        a='9' + digits[1:5], b=digits[5:], c=digits[:3], d=digits[3:6], e=digits[6:]
+    )
+    
+    lines = [name, email, phone, '']
+    for index in range(size_lines):
+        if index % max(size_lines // len(SECTIONS), 1) == 0:
+            lines.append(SECTIONS[(index // max(size_lines // len(SECTIONS), 1)) % len(SECTIONS)].upper())
+        words = [
+            rng.choice(SKILLS) if rng.random() < skill_density else rng.choice(FILLER)
+            for _ in range(rng.randint(6, 14))
+        ]
+        lines.append(' '.join(words).capitalize() + '.')
+    return lines
+
+
+def render_txt(lines):
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def render_docx(lines):
+    namespace = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    body = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    buffer = io.BytesIO()
+    # Fixed timestamps keep the archive bytes deterministic
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (
+            ('[Content_Types].xml',
+             '<?xml version="1.0" encoding="UTF-8"?>'
+             '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+             '<Default Extension="xml" ContentType="application/xml"/></Types>'),
+            ('word/document.xml',
+             f'<?xml version="1.0" encoding="UTF-8"?><w:document {namespace}><w:body>{body}</w:body></w:document>'),
+        ):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return buffer.getvalue()
+
+
+def render_pdf(lines, lines_per_page=50):
+    """Minimal multi-page PDF with one Helvetica text stream per page"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = {
+        1: '<< /Type /Catalog /Pages 2 0 R >>',
+        3: '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    kids = []
+    for index, page_lines in enumerate(pages):
+        content_id, page_id = 4 + index * 2, 5 + index * 2
+        text = ' '.join(
+            "(%s) '" % line.encode('latin-1', 'replace').decode('latin-1')
+            .replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            for line in page_lines
+        )
+        stream = f'BT /F1 10 Tf 40 780 Td 14 TL {text} ET'
+        objects[content_id] = f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream'
+        objects[page_id] = ('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>')
+        kids.append(f'{page_id} 0 R')
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += f'{number} 0 obj\n{objects[number]}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    size = max(objects) + 1
+    out += f'xref\n0 {size}\n0000000000 65535 f \n'.encode()
+    for number in range(1, size):
+        out += f'{offsets[number]:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
+
+
+def render_cfb(streams):
+    """OLE compound file (version 3, 512-byte sectors) holding the given root-level streams"""
+    end_of_chain, free, fat_marker = 0xFFFFFFFE, 0xFFFFFFFF, 0xFFFFFFFD
+    mini_stream, mini_fat, placed = bytearray(), [], []
+    big = []
+    for name, data in streams.items():
+        if len(data) < 4096:
+            # Small streams live in 64-byte mini sectors inside the root entry's stream
+            start, count = len(mini_stream) // 64, max(-(-len(data) // 64), 1)
+            mini_fat += list(range(start + 1, start + count)) + [end_of_chain]
+            mini_stream += data.ljust(count * 64, b'\0')
+            placed.append((name, start, len(data)))
+        else:
+            big.append((name, data))
+    
+    entries = 1 + len(streams)
+    blobs = [
+        ('directory', b'\0' * (-(-entries // 4) * 512)),
+        ('minifat', struct.pack(f'<{len(mini_fat)}I', *mini_fat) if mini_fat else b''),
+        ('ministream', bytes(mini_stream)),
+    ] + big
+    sectors = {name: -(-len(data) // 512) for name, data in blobs}
+    fat_count = 1
+    while fat_count * 128 < fat_count + sum(sectors.values()):
+        fat_count += 1
+    
+    fat, starts, body = [fat_marker] * fat_count, {}, bytearray()
+    for name, data in blobs:
+        count = sectors[name]
+        starts[name] = len(fat) if count else end_of_chain
+        fat += [len(fat) + i + 1 for i in range(count - 1)] + ([end_of_chain] if count else [])
+        body += data.ljust(count * 512, b'\0')
+    fat += [free] * (fat_count * 128 - len(fat))
+    
+    def entry(name, kind, start, size, child=free, right=free):
+        encoded = name.encode('utf-16-le') + b'\0\0'
+        return struct.pack('<64sHBBIII16sIQQIQ', encoded, len(encoded), kind, 1, free, right, child,
+                           b'\0' * 16, 0, 0, 0, start, size)
+    
+    # The root's children chained through right-sibling links
+    directory = entry('Root Entry', 5, starts['ministream'], len(mini_stream), child=1 if streams else free)
+    listed = placed + [(name, starts[name], len(data)) for name, data in big]
+    for index, (name, start, size) in enumerate(listed):
+        directory += entry(name, 2, start, size, right=index + 2 if index + 1 < len(listed) else free)
+    directory = directory.ljust(sectors['directory'] * 512, b'\0')
+    body[:len(directory)] = directory
+    
+    header = struct.pack(
+        '<8s16sHHHHH6sIIIIIIIII', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'\0' * 16, 0x3E, 3, 0xFFFE, 9, 6,
+        b'\0' * 6, 0, fat_count, starts['directory'], 0, 4096, starts['minifat'], sectors['minifat'],
+        end_of_chain, 0
+    ) + struct.pack('<109I', *(list(range(fat_count)) + [free] * (109 - fat_count)))
+    return header.ljust(512, b'\0') + struct.pack(f'<{len(fat)}I', *fat) + bytes(body)
+
+
+def render_doc(lines):
+    """Word 97 .doc: a minimal FIB and one piece, 8-bit when the text fits cp1252"""
+    text = '\r'.join(lines) + '\r'
+    text_offset = 1024
+    try:
+        encoded, fc = text.encode('cp1252'), (text_offset * 2) | 0x40000000
+    except UnicodeEncodeError:
+        encoded, fc = text.encode('utf-16-le'), text_offset
+    
+    # FibBase (Word 97, table in 1Table), 14 shorts, 22 longs with ccpText, 93 fc/lcb pairs with the CLX
+    longs = [0] * 22
+    longs[3] = len(text)
+    clx = struct.pack('<BI', 2, 16) + struct.pack('<iiHIH', 0, len(text), 0, fc, 0)
+    pairs = [0] * (93 * 2)
+    pairs[33 * 2:33 * 2 + 2] = [0, len(clx)]
+    fib = (
+        struct.pack('<HHHHHH', 0xA5EC, 0xC1, 0, 0x0409, 0, 0x0200).ljust(32, b'\0')
+        + struct.pack('<H', 14) + b'\0' * 28
+        + struct.pack('<H22i', 22, *longs)
+        + struct.pack(f'<H{len(pairs)}I', 93, *pairs) + struct.pack('<H', 0)
+    )
+    word = (fib.ljust(text_offset, b'\0') + encoded).ljust(4096, b'\0')
+    return render_cfb({'WordDocument': word, '1Table': clx})
+
+
+RENDERERS = {'txt': render_txt, 'docx': render_docx, 'pdf': render_pdf, 'doc': render_doc}
+
+
+def generate_corpus(count_per_variant=5, seed=1234, formats=FORMATS, sizes=None, densities=None):
+    """Yield (filename, raw bytes, variant dict) for every format/size/density combination"""
+    rng = random.Random(seed)
+    sizes = sizes or list(SIZES)
+    densities = densities or list(DENSITIES)
+    
+    for fmt in formats:
+        for size in sizes:
+            for density in densities:
+                for index in range(count_per_variant):
+                    lines = generate_lines(rng, SIZES[size], DENSITIES[density])
+                    variant = {'format': fmt, 'size': size, 'density': density}
+                    yield f"{size}-{density}-{index}.{fmt}", RENDERERS[fmt](lines), variant
@@ -0,0 +1,224 @@
+"""HTTP load test: endpoint latency under many concurrent clients.
+
+Usage (from the resume-parser directory)::
+
+    python -m benchmarks.loadtest --compare
+    python -m benchmarks.loadtest --serve gthread --clients 80 --duration 30
+    python -m benchmarks.loadtest --url http://localhost:5000
+
+Each client thread loops on one kind of request: ``health`` (GET /health),
+``small`` (POST /parse with a short TXT resume) or ``heavy`` (POST /parse
+with large PDFs). --serve starts gunicorn itself in the given mode;
+--compare runs the old sync worker and the threaded worker back to back on
+the same load so the latency difference can be read off one table.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from .bench import percentile
+from .corpus import generate_corpus
+
+SERVE_MODES = {
+    'sync': ['--worker-class', 'sync'],
+    'gthread': ['--worker-class', 'gthread', '--threads', '32'],
+}
+KINDS = ('health', 'small', 'heavy')
+
+
+def encode_multipart(files):
+    """(content type, body) for a multipart upload of (filename, bytes) pairs"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for filename, raw in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="files"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode() + raw + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return f'multipart/form-data; boundary={boundary}', b''.join(parts)
+
+
+def build_requests(seed):
+    """(method, path, files to upload) per request kind"""
+    small = list(generate_corpus(1, seed, ['txt'], ['small'], ['dense']))
+    heavy = list(generate_corpus(2, seed, ['pdf'], ['large'], ['dense']))
+    return {
+        'health': ('GET', '/health', None),
+        'small': ('POST', '/parse', [(name, raw) for name, raw, _ in small]),
+        'heavy': ('POST', '/parse', [(name, raw) for name, raw, _ in heavy]),
+    }
+
+
+def client_loop(base_url, request, deadline, think, samples, statuses, lock):
+    method, path, files = request
+    while time.monotonic() < deadline:
+        headers, body = {}, None
+        if files:
+            # A fresh trailing nonce per request keeps the result cache from answering instead of the parser
+            nonce = f'\n{uuid.uuid4().hex}\n'.encode()
+            content_type, body = encode_multipart([(name, raw + nonce) for name, raw in files])
+            headers['Content-Type'] = content_type
+        start = time.perf_counter()
+        retry_after = None
+        try:
+            req = urllib.request.Request(base_url + path, data=body, headers=headers, method=method)
+            with urllib.request.urlopen(req, timeout=120) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+            retry_after = e.headers.get('Retry-After')
+        except OSError:
+            status = 'error'
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            # Latency percentiles cover served requests; rejections only show up in the status counts
+            if status == 200:
+                samples.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        # Back off like a well-behaved client instead of hammering a saturated endpoint
+        pause = float(retry_after) if retry_after else think
+        time.sleep(min(pause, max(deadline - time.monotonic(), 0)))
+
+
+def run_load(base_url, clients, duration, mix, seed, think=0.2):
+    """Drive the server with `clients` threads for `duration` seconds; per-kind latency stats"""
+    requests = build_requests(seed)
+    lock = threading.Lock()
+    samples = {kind: [] for kind in KINDS}
+    statuses = {kind: {} for kind in KINDS}
+
+    # Client roles in proportion to the mix, at least one of each requested kind
+    roles = []
+    for kind in KINDS:
+        roles += [kind] * (max(1, round(clients * mix[kind])) if mix[kind] else 0)
+
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=client_loop, args=(base_url, requests[kind], deadline, think, samples[kind], statuses[kind], lock),
+            daemon=True
+        )
+        for kind in roles
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {'clients': len(roles), 'duration_s': duration}
+    for kind in KINDS:
+        values = samples[kind]
+        if not values:
+            continue
+        report[kind] = {
+            'served': len(values),
+            'per_s': round(len(values) / duration, 1),
+            'p50_ms': round(percentile(values, 50), 1),
+            'p95_ms': round(percentile(values, 95), 1),
+            'p99_ms': round(percentile(values, 99), 1),
+            'max_ms': round(max(values), 1),
+            'statuses': statuses[kind],
+        }
+    return report
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port):
+    """Start gunicorn on app:app in the given worker mode and wait for /health"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+        '--workers', '1', '--timeout', '120', '--log-level', 'warning', *SERVE_MODES[mode]
+    ]
+    server = subprocess.Popen(command, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f'gunicorn ({mode}) did not become healthy')
+
+
+def run_mode(mode, args, mix):
+    port = free_port()
+    server = start_server(mode, port)
+    try:
+        return run_load(f'http://127.0.0.1:{port}', args.clients, args.duration, mix, args.seed, args.think)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def print_report(label, report):
+    print(f"{label}: {report['clients']} clients for {report['duration_s']}s")
+    for kind in KINDS:
+        stats = report.get(kind)
+        if stats:
+            print(f"  {kind:<7} {stats['served']:>6} ok {stats['per_s']:>7}/s  p50 {stats['p50_ms']:>8}ms"
+                  f"  p95 {stats['p95_ms']:>8}ms  p99 {stats['p99_ms']:>8}ms  {stats['statuses']}")
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Load-test the resume parser HTTP endpoints.')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', help='base URL of a running server')
+    target.add_argument('--serve', choices=list(SERVE_MODES), help='start gunicorn in this worker mode')
+    target.add_argument('--compare', action='store_true', help='run sync and gthread modes and compare')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per run')
+    parser.add_argument('--health', type=float, default=0.4, help='share of clients polling /health')
+    parser.add_argument('--small', type=float, default=0.4, help='share of clients parsing small TXT files')
+    parser.add_argument('--heavy', type=float, default=0.2, help='share of clients parsing large PDFs')
+    parser.add_argument('--think', type=float, default=0.2, help='seconds each client pauses between requests')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--save', help='write results JSON to this path')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    mix = {'health': args.health, 'small': args.small, 'heavy': args.heavy}
+
+    if args.url:
+        reports = {'url': run_load(args.url.rstrip('/'), args.clients, args.duration, mix, args.seed, args.think)}
+    elif args.compare:
+        reports = {mode: run_mode(mode, args, mix) for mode in SERVE_MODES}
+    else:
+        mode = args.serve or 'gthread'
+        reports = {mode: run_mode(mode, args, mix)}
+
+    for label, report in reports.items():
+        print_report(label, report)
+    if args.compare:
+        for kind in KINDS:
+            before, after = reports['sync'].get(kind), reports['gthread'].get(kind)
+            if before and after and after['p95_ms']:
+                print(f"{kind} p95: {before['p95_ms']}ms -> {after['p95_ms']}ms "
+                      f"({before['p95_ms'] / after['p95_ms']:.1f}x)")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
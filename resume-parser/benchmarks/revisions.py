@@ -0,0 +1,120 @@
+"""Revision benchmark: re-parsing edited resumes with and without the chunk cache.
+
+Usage (from the resume-parser directory)::
+
+    python -m benchmarks.revisions
+    python -m benchmarks.revisions --docs 40 --edits 1 3 10 --sizes large
+
+Each resume is parsed once to fill the chunk cache, then revised copies
+with a few lines replaced are parsed with the cache off and on. The run
+also times the first parse of unseen resumes, which pays for chunking
+and fingerprinting without any hits, and fails if any result differs
+from the uncached parse.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from resume_parser import chunks, decode_text, parse_resume_content
+
+from .corpus import DENSITIES, FILLER, SIZES, SKILLS, generate_corpus
+
+
+def revise(text, edits, rng):
+    """The text with `edits` random lines replaced by new filler and skill lines"""
+    lines = text.split('\n')
+    for _ in range(edits):
+        words = [rng.choice(SKILLS if rng.random() < 0.3 else FILLER) for _ in range(rng.randint(6, 14))]
+        lines[rng.randrange(len(lines))] = ' '.join(words).capitalize() + '.'
+    return '\n'.join(lines)
+
+
+def timed_parse(texts, cache, repeat):
+    """(best ms per document over `repeat` runs, results) with the given chunk cache installed"""
+    saved = chunks.chunk_cache
+    chunks.chunk_cache = cache
+    try:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [parse_resume_content(text) for text in texts]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000 / len(texts), results
+    finally:
+        chunks.chunk_cache = saved
+
+
+def run(texts, edits, seed, repeat):
+    rng = random.Random(seed)
+    report = {}
+    mismatches = 0
+
+    # Unseen documents: a fresh cache per run, so every chunk misses
+    uncached_ms, expected = timed_parse(texts, None, repeat)
+    best = None
+    for _ in range(repeat):
+        cold_ms, results = timed_parse(texts, chunks.ChunkCache(chunks.CHUNK_CACHE_DEFAULT_ENTRIES), 1)
+        best = cold_ms if best is None else min(best, cold_ms)
+        mismatches += sum(1 for a, b in zip(results, expected) if a != b)
+    report['unseen'] = {'uncached_ms': round(uncached_ms, 2), 'cached_ms': round(best, 2)}
+
+    for count in edits:
+        revised = [revise(text, count, rng) for text in texts]
+        uncached_ms, expected = timed_parse(revised, None, repeat)
+        best = None
+        for _ in range(repeat):
+            # A cache holding only the originals, since a second pass would also find the revised chunks
+            cache = chunks.ChunkCache(chunks.CHUNK_CACHE_DEFAULT_ENTRIES)
+            timed_parse(texts, cache, 1)
+            before = dict(cache.stats)
+            cached_ms, results = timed_parse(revised, cache, 1)
+            best = cached_ms if best is None else min(best, cached_ms)
+            mismatches += sum(1 for a, b in zip(results, expected) if a != b)
+        hits = sum(cache.stats[event] - before[event] for event in ('memory_hits', 'disk_hits'))
+        misses = cache.stats['misses'] - before['misses']
+        report[f'{count}_edits'] = {
+            'uncached_ms': round(uncached_ms, 2),
+            'cached_ms': round(best, 2),
+            'chunks_reused': round(hits / max(hits + misses, 1), 3),
+        }
+    return report, mismatches
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Time re-parsing of revised resumes with the chunk cache.')
+    parser.add_argument('--docs', type=int, default=20)
+    parser.add_argument('--edits', type=int, nargs='+', default=[1, 3, 10], help='lines replaced per revision')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['medium', 'large'])
+    parser.add_argument('--densities', nargs='+', choices=list(DENSITIES), default=list(DENSITIES))
+    parser.add_argument('--save', help='write results JSON to this path')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    per_variant = max(args.docs // (len(args.sizes) * len(args.densities)), 1)
+    corpus = generate_corpus(per_variant, args.seed, ['txt'], args.sizes, args.densities)
+    texts = [decode_text(raw) for _, raw, _ in corpus]
+    # Build the skill index before anything is timed
+    parse_resume_content(texts[0])
+
+    report, mismatches = run(texts, args.edits, args.seed, args.repeat)
+    report['docs'] = len(texts)
+    report['mismatches'] = mismatches
+    print(json.dumps(report))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+    if mismatches:
+        print(f'{mismatches} results differ from the uncached parse', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+"""Startup benchmark: cold gunicorn workers against preloaded, pre-warmed ones.
+
+Usage (from the resume-parser directory)::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --workers 2 --restarts 5
+
+For each mode gunicorn is started and timed until /health answers 200,
+then one upload per format is parsed and the first-request latency of
+each is recorded. Then the workers are stopped --restarts times, as a deploy or
+max-requests recycle would, and the time until /health is back and the
+first parse after it are measured again. ``cold`` is the old setup
+(no --preload, no warm-up parses); ``preload`` builds the parser state and
+runs the warm-up once in the master and forks warm workers from it.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from .bench import percentile
+from .corpus import generate_corpus
+from .loadtest import encode_multipart, free_port
+
+STARTUP_MODES = {
+    'cold': ([], {'WARMUP_PARSES': '0'}),
+    'preload': (['--preload'], {'WARMUP_PARSES': '1'}),
+}
+
+
+def wait_healthy(port, timeout=60):
+    """Seconds until GET /health answers 200"""
+    start = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1):
+                return time.perf_counter() - start
+        except (OSError, urllib.error.HTTPError):
+            time.sleep(0.01)
+    raise RuntimeError('gunicorn did not become healthy')
+
+
+def timed_parse(port, filename, raw):
+    """Milliseconds for one POST /parse of a fresh (never cached) upload"""
+    nonce = f'\n{uuid.uuid4().hex}\n'.encode()
+    content_type, body = encode_multipart([(filename, raw + nonce)])
+    req = urllib.request.Request(
+        f'http://127.0.0.1:{port}/parse', data=body, headers={'Content-Type': content_type}, method='POST'
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=120) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def child_pids(pid):
+    """Direct children of a process (the gunicorn workers of a master), from /proc"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may hold spaces; the parent pid is the second field after it
+        if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def tree_pss_kb(pid):
+    """Proportional set size of a process and its descendants; shared pages are split between them"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            own = next(int(line.split()[1]) for line in f if line.startswith('Pss:'))
+    except (OSError, StopIteration):
+        own = 0
+    return own + sum(tree_pss_kb(child) for child in child_pids(pid))
+
+
+def run_mode(mode, args, samples):
+    flags, env = STARTUP_MODES[mode]
+    port = free_port()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [
+        sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(args.workers), '--worker-class', 'gthread', '--threads', '32',
+        '--timeout', '120', '--log-level', 'warning', *flags
+    ]
+    server = subprocess.Popen(
+        command, cwd=root, env={**os.environ, **env}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        report = {'mode': mode, 'startup_s': round(wait_healthy(port), 3)}
+        report['first_parse_ms'] = {fmt: round(timed_parse(port, name, raw), 1) for fmt, name, raw in samples}
+        report['pss_mb'] = round(tree_pss_kb(server.pid) / 1024, 1)
+
+        restart_s, restart_parse_ms = [], []
+        for _ in range(args.restarts):
+            workers = child_pids(server.pid)
+            for worker in workers:
+                os.kill(worker, signal.SIGTERM)
+            start = time.perf_counter()
+            # Wait for the master to notice and fork replacements before polling /health
+            while set(child_pids(server.pid)) & set(workers) or len(child_pids(server.pid)) < args.workers:
+                time.sleep(0.005)
+            wait_healthy(port)
+            restart_s.append(time.perf_counter() - start)
+            fmt, name, raw = samples[-1]
+            restart_parse_ms.append(timed_parse(port, name, raw))
+        if args.restarts:
+            report['restart_p50_s'] = round(percentile(restart_s, 50), 3)
+            report['restart_first_parse_p50_ms'] = round(percentile(restart_parse_ms, 50), 1)
+        return report
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description='Compare gunicorn startup with and without preload and warm-up.')
+    parser.add_argument('--modes', nargs='+', choices=list(STARTUP_MODES), default=list(STARTUP_MODES))
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--restarts', type=int, default=3, help='worker kills per mode')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--save', help='write results JSON to this path')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    samples = [
+        (fmt, name, raw) for fmt in ('txt', 'docx', 'pdf')
+        for name, raw, _ in generate_corpus(1, args.seed, [fmt], ['large'], ['dense'])
+    ]
+    reports = [run_mode(mode, args, samples) for mode in args.modes]
+    for report in reports:
+        print(json.dumps(report))
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
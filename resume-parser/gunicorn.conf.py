@@ -0,0 +1,13 @@
+"""Gunicorn server hooks; bind, workers and threads stay on the command line (Procfile, railway.json)"""
+import gc
+
+
+def when_ready(server):
+    # With --preload the app, its skill index and warm-up state live in the master by now. Freezing
+    # them keeps the workers' garbage collector from touching, and so copying, the shared pages.
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from app import warm_up_worker
+    warm_up_worker()
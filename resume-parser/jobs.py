@@ -0,0 +1,122 @@
+"""Background job progress shared by gunicorn workers.
+
+A job's files are parsed by the worker that accepted it, but status polls
+and result streams may land on any worker. So every job and each finished
+file's result live in a SQLite file that all workers on the host open.
+Streams in the recording worker wake as soon as a result is stored; the
+other workers poll.
+"""
+import json
+import threading
+import time
+import uuid
+
+from resume_parser.storage import SQLiteConnections
+
+
+class JobStore:
+    """Jobs and their per-file results in SQLite, readable from any process"""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = SQLiteConnections(path, [
+            'CREATE TABLE IF NOT EXISTS jobs '
+            '(id TEXT PRIMARY KEY, total INTEGER, completed INTEGER, created REAL, finished REAL)',
+            # seq is the completion order, which result streams follow
+            'CREATE TABLE IF NOT EXISTS job_results '
+            '(job TEXT, seq INTEGER, idx INTEGER, result TEXT, PRIMARY KEY (job, seq)) WITHOUT ROWID',
+        ], pragmas=('journal_mode=WAL', 'synchronous=NORMAL'))
+        self.updated = threading.Condition()
+        self.version = 0
+
+    def create(self, total):
+        """Register a job of ``total`` files; returns its id"""
+        job_id = uuid.uuid4().hex
+        with self.db.get() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, total, completed, created, finished) VALUES (?, ?, 0, ?, NULL)',
+                (job_id, total, time.time())
+            )
+        return job_id
+
+    def record(self, job_id, index, result):
+        """Store the result of the job's file at ``index``"""
+        result['index'] = index
+        with self.db.get() as conn:
+            # SET expressions see the old row, so completed + 1 is the count after this result
+            conn.execute(
+                'UPDATE jobs SET completed = completed + 1, '
+                'finished = CASE WHEN completed + 1 >= total THEN ? END WHERE id = ?',
+                (time.time(), job_id)
+            )
+            row = conn.execute('SELECT completed FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                # Expired while its files were still parsing
+                return
+            conn.execute(
+                'INSERT INTO job_results (job, seq, idx, result) VALUES (?, ?, ?, ?)',
+                (job_id, row[0], index, json.dumps(result))
+            )
+        with self.updated:
+            self.version += 1
+            self.updated.notify_all()
+
+    def _read(self, job_id, query, params):
+        # One read transaction, so the job row and its results agree
+        with self.db.get() as conn:
+            conn.execute('BEGIN')
+            job = conn.execute(
+                'SELECT total, completed, created, finished FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+            rows = conn.execute(query, params).fetchall() if job is not None else []
+        return job, rows
+
+    def status(self, job_id):
+        """Progress and the results so far (in file order), or None for an unknown job"""
+        job, rows = self._read(job_id, 'SELECT result FROM job_results WHERE job = ? ORDER BY idx', (job_id,))
+        if job is None:
+            return None
+        total, completed, created, finished = job
+        results = [json.loads(result) for result, in rows]
+        return {
+            'id': job_id,
+            'status': 'completed' if completed >= total else ('running' if completed else 'queued'),
+            'total': total,
+            'completed': completed,
+            'failed': len([r for r in results if not r['success']]),
+            'created': created,
+            'finished': finished,
+            'results': results
+        }
+
+    def iter_results(self, job_id, poll_interval=1.0):
+        """Yield a job's results in completion order, blocking until each one is ready"""
+        sent = 0
+        while True:
+            with self.updated:
+                version = self.version
+            job, rows = self._read(
+                job_id, 'SELECT seq, result FROM job_results WHERE job = ? AND seq > ? ORDER BY seq', (job_id, sent)
+            )
+            if job is None:
+                return
+            for seq, result in rows:
+                sent = seq
+                yield json.loads(result)
+            if sent >= job[0]:
+                return
+            if not rows:
+                with self.updated:
+                    if self.version == version:
+                        self.updated.wait(poll_interval)
+
+    def exists(self, job_id):
+        return self.db.get().execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone() is not None
+
+    def expire(self, cutoff):
+        """Forget jobs that finished before ``cutoff`` (a time.time() value)"""
+        with self.db.get() as conn:
+            conn.execute(
+                'DELETE FROM job_results WHERE job IN (SELECT id FROM jobs WHERE finished < ?)', (cutoff,)
+            )
+            conn.execute('DELETE FROM jobs WHERE finished < ?', (cutoff,))
@@ -0,0 +1,234 @@
+"""Prometheus text-format metrics that aggregate across gunicorn workers.
+
+Each process keeps its counters and histograms in memory. When METRICS_DIR
+is set, every process also snapshots its values to
+METRICS_DIR/<pid>.<token>.json (at most once per flush interval, and on
+every scrape), and /metrics sums all snapshots, so any worker can answer for
+the whole server. The random token keeps a recycled pid from overwriting a
+dead worker's file; snapshots of dead processes are folded into
+retired.json, so totals never drop when a worker restarts. Without a
+directory, /metrics reports the answering process only.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' snapshots are then left in place
+    fcntl = None
+
+RETIRED_SNAPSHOT = 'retired.json'
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricsRegistry:
+    def __init__(self, directory=None, flush_interval=1.0, buckets=DEFAULT_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = tuple(buckets)
+        self.meta = {}  # name -> (type, help)
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+        self._after_fork()
+        
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+        # A forked worker gets its own snapshot file and must not inherit a held lock
+        os.register_at_fork(after_in_child=self._after_fork)
+    
+    def _after_fork(self):
+        self.flush_lock = threading.Lock()
+        self.last_flush = 0.0
+        self.snapshot_name = f'{os.getpid()}.{uuid.uuid4().hex[:12]}.json'
+    
+    def describe(self, name, metric_type, help_text):
+        self.meta[name] = (metric_type, help_text)
+    
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+    
+    def inc(self, name, value=1.0, **labels):
+        key = (name, self._labels(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+        self.maybe_flush()
+    
+    def observe(self, name, seconds, **labels):
+        key = (name, self._labels(labels))
+        with self.lock:
+            values = self.histograms.get(key)
+            if values is None:
+                values = self.histograms[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    values[i] += 1
+            values[-2] += seconds
+            values[-1] += 1
+        self.maybe_flush()
+    
+    def _snapshot(self):
+        with self.lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), list(values)] for (name, labels), values in self.histograms.items()]
+            }
+    
+    def maybe_flush(self):
+        if not self.directory or time.monotonic() - self.last_flush < self.flush_interval:
+            return
+        # Another thread already writing the snapshot makes this one redundant
+        if self.flush_lock.acquire(blocking=False):
+            try:
+                if time.monotonic() - self.last_flush >= self.flush_interval:
+                    self._write_snapshot()
+            finally:
+                self.flush_lock.release()
+    
+    def flush(self):
+        """Write this process's values to the shared directory"""
+        if not self.directory:
+            return
+        with self.flush_lock:
+            self._write_snapshot()
+    
+    def _write_snapshot(self):
+        # Caller holds self.flush_lock
+        self.last_flush = time.monotonic()
+        self._write_json(self.snapshot_name, self._snapshot())
+    
+    def _write_json(self, name, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def _read_json(self, name):
+        try:
+            with open(os.path.join(self.directory, name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _pid_alive(name):
+        try:
+            os.kill(int(name.split('.', 1)[0]), 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, ValueError):
+            pass
+        return True
+    
+    def _retire_dead(self, names):
+        """Fold snapshots of exited processes into retired.json; returns the names still live"""
+        # Caller holds .retire.lock
+        dead = [name for name in names if not self._pid_alive(name)]
+        if not dead:
+            return names
+        
+        retired = self._read_json(RETIRED_SNAPSHOT) or {'counters': [], 'histograms': [], 'merged': []}
+        # A crash between writing retired.json and unlinking a snapshot must not count it twice
+        merged = set(retired.get('merged', ()))
+        fold = [name for name in dead if name not in merged]
+        snapshots = [snapshot for snapshot in map(self._read_json, fold) if snapshot is not None]
+        if snapshots:
+            counters, histograms = self._merge([retired] + snapshots)
+            retired = {
+                'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+                'histograms': [[name, list(labels), values] for (name, labels), values in histograms.items()],
+            }
+        existing = set(os.listdir(self.directory))
+        retired['merged'] = sorted(name for name in merged | set(fold) if name in existing)
+        self._write_json(RETIRED_SNAPSHOT, retired)
+        for name in dead:
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        return [name for name in names if name not in dead]
+    
+    def _collect(self):
+        """Sum the snapshots of every process (or just this one)"""
+        if not self.directory:
+            return self._merge([self._snapshot()])
+        
+        self.flush()
+        if fcntl is None:
+            return self._read_snapshots(retire=False)
+        # Scrapes in other workers must not see a snapshot both in retired.json and on its own
+        with open(os.path.join(self.directory, '.retire.lock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._read_snapshots(retire=True)
+    
+    def _read_snapshots(self, retire):
+        names = [
+            name for name in os.listdir(self.directory)
+            if name.endswith('.json') and not name.startswith('.') and name != RETIRED_SNAPSHOT
+        ]
+        if retire:
+            names = self._retire_dead(names)
+        snapshots = [self._read_json(name) for name in names + [RETIRED_SNAPSHOT]]
+        return self._merge([snapshot for snapshot in snapshots if snapshot is not None])
+    
+    @staticmethod
+    def _merge(snapshots):
+        counters = {}
+        histograms = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, values in snapshot['histograms']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    merged[i] += value
+        return counters, histograms
+    
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+    
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        counters, histograms = self._collect()
+        lines = []
+        
+        for name in sorted({name for name, _ in counters} | {name for name, _ in histograms} | set(self.meta)):
+            metric_type, help_text = self.meta.get(name, ('untyped', ''))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{self._format_labels(labels)} {value}')
+            
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                # Bucket counts are already cumulative: observe() bumps every bound >= the value
+                for bound, count in zip(self.buckets, values):
+                    lines.append(f'{name}_bucket{self._format_labels(labels, [("le", repr(bound))])} {count}')
+                lines.append(f'{name}_bucket{self._format_labels(labels, [("le", "+Inf")])} {values[-1]}')
+                lines.append(f'{name}_sum{self._format_labels(labels)} {values[-2]}')
+                lines.append(f'{name}_count{self._format_labels(labels)} {values[-1]}')
+        
+        return '\n'.join(lines) + '\n'
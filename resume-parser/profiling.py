@@ -0,0 +1,83 @@
+"""On-demand profiling of a single request.
+
+Two modes:
+- ``pstats``: deterministic cProfile run, saved as a binary pstats file
+  (open with ``python -m pstats`` or snakeviz).
+- ``collapsed``: a sampling profiler that snapshots the calling thread's
+  stack every few milliseconds and writes folded stacks
+  (``frame;frame;frame count`` lines) for flamegraph.pl or speedscope.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import uuid
+
+PROFILE_MODES = ('pstats', 'collapsed')
+
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread"""
+    
+    def __init__(self, thread_id, interval=0.002):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+    
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = ';'.join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+    
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+
+def profile_call(mode, directory, func, *args, **kwargs):
+    """Run func under the given profiler; return (result, profile_id, artifact_path, seconds)"""
+    os.makedirs(directory, exist_ok=True)
+    profile_id = uuid.uuid4().hex
+    start = time.perf_counter()
+    
+    if mode == 'collapsed':
+        with StackSampler(threading.get_ident()) as sampler:
+            result = func(*args, **kwargs)
+        path = os.path.join(directory, f'{profile_id}.collapsed')
+        with open(path, 'w') as f:
+            f.write(sampler.collapsed())
+    else:
+        profiler = cProfile.Profile()
+        result = profiler.runcall(func, *args, **kwargs)
+        path = os.path.join(directory, f'{profile_id}.pstats')
+        profiler.dump_stats(path)
+    
+    return result, profile_id, path, time.perf_counter() - start
+
+
+def find_profile(directory, profile_id):
+    """Path of a stored artifact, or None (ids are hex so no path traversal is possible)"""
+    if not profile_id.isalnum():
+        return None
+    for mode in PROFILE_MODES:
+        path = os.path.join(directory, f'{profile_id}.{mode}')
+        if os.path.exists(path):
+            return path
+    return None
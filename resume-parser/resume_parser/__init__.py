@@ -0,0 +1,55 @@
+"""Resume parsing library: text extraction and field parsing without the web app"""
+from .batch import BATCH_FIELDS, parse_many
+from .budget import BudgetExceeded, ParseBudget, limit_worker_memory
+from .contacts import normalize_phone, scan_contacts
+from .dedup import MinHashIndex, minhash_signature, signature_similarity
+from .extract import (
+    NoTextLayerError, UnsupportedFormatError, decode_text, detect_encoding, extract_doc_text, extract_docx_text,
+    extract_pages, extract_pdf_text, iter_docx_paragraphs, iter_pdf_pages, register_extractor, sniff_format
+)
+from .names import extract_name_from_content, validate_name
+from .parser import (
+    PARSER_VERSION, parse_resume_content, parse_resume_pages, process_resume_file, process_resume_path
+)
+from .sections import SectionSegmenter, segment_sections
+from .skills import SkillMatcher, build_skill_matcher, get_skill_matcher, load_skill_taxonomy
+from .warmup import warm_up
+
+__all__ = [
+    'BATCH_FIELDS',
+    'BudgetExceeded',
+    'MinHashIndex',
+    'NoTextLayerError',
+    'PARSER_VERSION',
+    'ParseBudget',
+    'SectionSegmenter',
+    'SkillMatcher',
+    'UnsupportedFormatError',
+    'build_skill_matcher',
+    'decode_text',
+    'detect_encoding',
+    'extract_doc_text',
+    'extract_docx_text',
+    'extract_name_from_content',
+    'extract_pages',
+    'extract_pdf_text',
+    'get_skill_matcher',
+    'iter_docx_paragraphs',
+    'iter_pdf_pages',
+    'limit_worker_memory',
+    'load_skill_taxonomy',
+    'minhash_signature',
+    'normalize_phone',
+    'parse_many',
+    'parse_resume_content',
+    'parse_resume_pages',
+    'process_resume_file',
+    'process_resume_path',
+    'register_extractor',
+    'scan_contacts',
+    'segment_sections',
+    'signature_similarity',
+    'sniff_format',
+    'validate_name',
+    'warm_up',
+]
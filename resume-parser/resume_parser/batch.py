@@ -0,0 +1,130 @@
+"""Batch parsing: many resume texts per call, results as columns"""
+from .contacts import normalize_phone, rank_contacts, scan_contacts
+from .names import NAME_SCAN_LINES, extract_name_from_content
+from .parser import CONTACT_SECTIONS, SKILL_FALLBACK_SECTIONS, SKILL_SECTIONS
+from .sections import HEADER_SECTION, SectionSegmenter
+from .skills import get_skill_matcher
+
+# Column order of parse_many results (the fields of parse_resume_content)
+BATCH_FIELDS = ('name', 'email', 'phone', 'phone_e164', 'emails', 'phones', 'skills', 'skill_categories')
+
+
+def _head_lines(content):
+    """The first NAME_SCAN_LINES non-empty stripped lines, without splitting the whole text"""
+    limit = NAME_SCAN_LINES
+    while True:
+        parts = content.split('\n', limit)
+        complete = len(parts) <= limit
+        lines = [line.strip() for line in (parts if complete else parts[:limit]) if line.strip()]
+        if complete or len(lines) >= NAME_SCAN_LINES:
+            return lines
+        limit *= 4
+
+
+def _scan_blocks(blocks, want_emails=True, want_phones=True):
+    emails = []
+    phones = []
+    for _, offset, text in blocks:
+        block_emails, block_phones = scan_contacts(text)
+        if want_emails:
+            emails.extend((priority, offset + pos, email) for priority, pos, email in block_emails)
+        if want_phones:
+            phones.extend((priority, offset + pos, phone) for priority, pos, phone in block_phones)
+    return emails, phones
+
+
+def parse_many(texts):
+    """Parse a batch of resume texts one stage at a time; {field: [value per text]}.
+
+    Gives the same values as parse_resume_content on each text, but runs
+    each stage across the whole batch: every text is segmented, then the
+    skill taxonomy is matched against all skill sections in one batch call
+    (word-set matching instead of a regex pass per block), then contacts and
+    names are scanned, without per-stage timers. The columns are plain lists
+    in BATCH_FIELDS order, so they can go straight to csv.writer (zip them)
+    or to a dataframe / Parquet table constructor.
+    """
+    skill_matcher = get_skill_matcher()
+    documents = []
+
+    # Stage 1: normalize and segment every text
+    for text in texts:
+        if not text.strip():
+            documents.append(None)
+            continue
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        # One lowercase copy serves heading detection and skill matching; offsets into it
+        # only line up with the text's when lowering kept every character (ASCII)
+        lowered = text.lower() if text.isascii() else None
+        segmenter = SectionSegmenter()
+        blocks = segmenter.feed(text, lowered)
+        documents.append((text, blocks, segmenter.headings, lowered))
+
+    # Stage 2: skills, primary sections for the whole batch, then fallbacks for the texts still empty
+    terms = [set() for _ in documents]
+    pending = [index for index, document in enumerate(documents) if document is not None]
+    for sections in (SKILL_SECTIONS, SKILL_FALLBACK_SECTIONS, None):
+        if not pending:
+            break
+        contents = []
+        for index in pending:
+            _, blocks, _, lowered = documents[index]
+            selected = [
+                (offset, text) for section, offset, text in blocks
+                if (section in sections if sections is not None
+                    else section not in SKILL_SECTIONS and section not in SKILL_FALLBACK_SECTIONS)
+            ]
+            if lowered is None:
+                contents.append('\n'.join(text for _, text in selected).lower())
+            else:
+                contents.append('\n'.join(lowered[offset:offset + len(text)] for offset, text in selected))
+        for index, found in zip(pending, skill_matcher.find_terms_many(contents)):
+            terms[index] = found
+        pending = [index for index in pending if not terms[index]]
+
+    columns = {field: [] for field in BATCH_FIELDS}
+    for document, document_terms in zip(documents, terms):
+        if document is None:
+            # Same defaults parse_resume_content returns for empty text
+            values = ('Not found', 'Not found', 'Not found', 'Not found', [], [], ['Not specified'], {})
+            for field, value in zip(BATCH_FIELDS, values):
+                columns[field].append(value)
+            continue
+        text, blocks, headings, _ = document
+
+        # Stage 3: contacts from the header/contact blocks, the rest only for missing fields
+        emails, phones = _scan_blocks(block for block in blocks if block[0] in CONTACT_SECTIONS)
+        if not emails or not phones:
+            more_emails, more_phones = _scan_blocks(
+                (block for block in blocks if block[0] not in CONTACT_SECTIONS), not emails, not phones
+            )
+            emails += more_emails
+            phones += more_phones
+        emails = rank_contacts(emails)
+        phones = rank_contacts(phones)
+        phone_numbers = []
+        for phone in phones:
+            number = normalize_phone(phone) or phone
+            if number not in phone_numbers:
+                phone_numbers.append(number)
+
+        # Stage 4: name from the header block, then from the head of the text
+        name = 'Not found'
+        if headings:
+            header = ''.join(block_text for section, _, block_text in blocks if section == HEADER_SECTION)
+            if header:
+                header_lines = [line.strip() for line in header.split('\n') if line.strip()]
+                name = extract_name_from_content(header_lines, header)
+        if name == 'Not found':
+            name = extract_name_from_content(_head_lines(text), text)
+
+        skills = skill_matcher.canonical(document_terms)
+        columns['name'].append(name)
+        columns['email'].append(emails[0] if emails else 'Not found')
+        columns['phone'].append(phones[0] if phones else 'Not found')
+        columns['phone_e164'].append((normalize_phone(phones[0]) or 'Not found') if phones else 'Not found')
+        columns['emails'].append(emails)
+        columns['phones'].append(phone_numbers)
+        columns['skills'].append(skills if skills else ['Not specified'])
+        columns['skill_categories'].append(skill_matcher.categorize(skills))
+    return columns
@@ -0,0 +1,120 @@
+"""Per-file CPU-time and memory budgets for extraction and parsing"""
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PARSE_CPU_BUDGET = float(os.environ.get('PARSE_CPU_BUDGET', 10))  # CPU seconds per file, 0 = unlimited
+# Decompressed/extracted bytes per file, as charged by the extractors; not a process memory limit
+PARSE_MEMORY_BUDGET = int(os.environ.get('PARSE_MEMORY_BUDGET', 16 * 1024 * 1024))
+# Address space a pool process may grow by past its size at startup (RLIMIT_AS), 0 = unlimited.
+# This is the real memory bound: it also covers PyPDF2's inflation, which is never charged.
+PARSE_WORKER_MEMORY_LIMIT = int(os.environ.get('PARSE_WORKER_MEMORY_LIMIT', 1024 * 1024 * 1024))
+# Code that never reaches a budget check (one enormous PDF page) is stopped by a CPU timer
+# signal at this multiple of the budget; signals only work in a process's main thread
+PARSE_CPU_HARD_LIMIT_FACTOR = 1.5
+
+
+class BudgetExceeded(BaseException):
+    """A file used up its CPU or memory budget.
+
+    A BaseException, like KeyboardInterrupt, so the broad ``except
+    Exception`` fallbacks in the extractors and in PyPDF2 let it through.
+    """
+
+    def __init__(self, resource):
+        super().__init__(f"{resource} budget exceeded")
+        self.resource = resource
+
+
+def _address_space_size():
+    # VmSize of this process, None where /proc is unavailable
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmSize:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def limit_worker_memory():
+    """Pool initializer: cap the process's address space so a runaway parse raises MemoryError.
+
+    The limit is relative to the size the process forked with, which
+    includes the parent's thread stacks and shared parser state.
+    """
+    if not PARSE_WORKER_MEMORY_LIMIT or resource is None:
+        return
+    size = _address_space_size()
+    if size is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = size + PARSE_WORKER_MEMORY_LIMIT
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not limit pool process memory: {str(e)}")
+
+
+class ParseBudget:
+    """CPU time and decompressed bytes one file may use.
+
+    Extractors call ``charge`` with the bytes they inflate or extract and
+    the parser calls ``check`` between pages; both raise BudgetExceeded once
+    a limit is passed, and ``exceeded`` remembers which one, so callers that
+    catch it can keep the text they already have and mark the result as
+    truncated.
+    """
+
+    def __init__(self, cpu_seconds=None, memory_bytes=None):
+        self.cpu_seconds = PARSE_CPU_BUDGET if cpu_seconds is None else cpu_seconds
+        self.memory_bytes = PARSE_MEMORY_BUDGET if memory_bytes is None else memory_bytes
+        self.started = time.thread_time()
+        self.used_bytes = 0
+        self.exceeded = None
+
+    def _exceed(self, resource):
+        self.exceeded = self.exceeded or resource
+        raise BudgetExceeded(resource)
+
+    def check(self):
+        if self.cpu_seconds and time.thread_time() - self.started > self.cpu_seconds:
+            self._exceed('cpu')
+
+    def charge(self, size):
+        self.used_bytes += size
+        if self.memory_bytes and self.used_bytes > self.memory_bytes:
+            self._exceed('memory')
+        self.check()
+
+    @contextmanager
+    def enforce(self):
+        """Arm a hard CPU stop for the block when running in the main thread (pool workers, the CLI)"""
+        if (not self.cpu_seconds or not hasattr(signal, 'setitimer')
+                or threading.current_thread() is not threading.main_thread()):
+            yield self
+            return
+
+        def on_timer(signum, frame):
+            self._exceed('cpu')
+
+        previous = signal.signal(signal.SIGVTALRM, on_timer)
+        signal.setitimer(signal.ITIMER_VIRTUAL, self.cpu_seconds * PARSE_CPU_HARD_LIMIT_FACTOR)
+        try:
+            yield self
+        finally:
+            signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+            signal.signal(signal.SIGVTALRM, previous)
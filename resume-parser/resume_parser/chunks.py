@@ -0,0 +1,120 @@
+"""Content-defined chunks of resume text and a cache of per-chunk scan results"""
+import hashlib
+import json
+import os
+import zlib
+
+from .contacts import scan_contacts
+from .storage import TieredCache
+
+CHUNK_CACHE_PATH = os.environ.get('CHUNK_CACHE_PATH') or None  # SQLite file shared by processes; unset = memory only
+# Off unless configured: a per-process LRU rarely sees the same resume twice, and unseen
+# resumes pay for chunking and fingerprinting without any hits
+CHUNK_CACHE_DEFAULT_ENTRIES = 20000
+CHUNK_CACHE_MAX_ENTRIES = int(os.environ.get(
+    'CHUNK_CACHE_MAX_ENTRIES', CHUNK_CACHE_DEFAULT_ENTRIES if CHUNK_CACHE_PATH else 0
+))  # per process, 0 = disabled
+# Bump when scan_contacts or find_terms change what they return for the same text
+CHUNK_CACHE_VERSION = 2
+
+# Chunks end after a line whose crc32 is divisible by CHUNK_LINE_DIVISOR once they hold
+# CHUNK_MIN_SIZE characters (CHUNK_MAX_SIZE forces a cut), so an edit only moves the
+# boundaries next to it and the chunks before and after keep their fingerprints
+CHUNK_MIN_SIZE = 2048
+CHUNK_MAX_SIZE = 8192
+CHUNK_LINE_DIVISOR = 4
+
+
+def _cut_allowed(char):
+    # A phone span (contacts.PHONE_SPAN) may run across a line break, so cuts only go
+    # before lines that cannot continue one
+    return not (char.isspace() or char.isdecimal() or char in '+().-')
+
+
+def split_chunks(text):
+    """(offset, chunk) pairs covering the text, cut only at line boundaries.
+
+    Skill terms and emails never span a line, and cuts never split a
+    candidate phone span, so scanning the chunks one by one finds the same
+    matches at the same offsets as scanning the whole text.
+    """
+    chunks = []
+    start = 0
+    length = len(text)
+    while True:
+        # Jump to the first line ending past the minimum size, then go line by line
+        end = text.find('\n', start + CHUNK_MIN_SIZE - 1) + 1
+        line_start = max(text.rfind('\n', start, end - 1) + 1, start)
+        while 0 < end < length:
+            if _cut_allowed(text[end]) and (
+                    end - start >= CHUNK_MAX_SIZE
+                    or zlib.crc32(text[line_start:end].encode('utf-8', 'surrogatepass')) % CHUNK_LINE_DIVISOR == 0):
+                break
+            line_start = end
+            end = text.find('\n', end) + 1
+        else:
+            break
+        chunks.append((start, text[start:end]))
+        start = end
+    if start < length:
+        chunks.append((start, text[start:]))
+    return chunks
+
+
+def chunk_key(kind, version, chunk):
+    """Cache key of a chunk's scan results: scan kind, scanner version and the chunk's fingerprint"""
+    digest = hashlib.blake2b(chunk.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    return f"{CHUNK_CACHE_VERSION}:{kind}:{version}:{digest}"
+
+
+class ChunkCache(TieredCache):
+    """Per-chunk scan results keyed by chunk fingerprint.
+
+    An in-process LRU bounded by entry count sits in front of an optional
+    SQLite store, so pool processes and gunicorn workers on the same host
+    reuse each other's chunks. Values are JSON-compatible lists.
+    """
+
+    name = 'Chunk cache'
+
+    def __init__(self, max_entries, disk_path=None):
+        super().__init__('chunk_scans', max_entries, disk_path)
+
+    _dump = staticmethod(json.dumps)
+    _load = staticmethod(json.loads)
+
+
+chunk_cache = ChunkCache(CHUNK_CACHE_MAX_ENTRIES, CHUNK_CACHE_PATH) if CHUNK_CACHE_MAX_ENTRIES > 0 else None
+
+
+def find_terms_chunked(skill_matcher, text):
+    """skill_matcher.find_terms(text.lower()), re-scanning only chunks the cache has not seen"""
+    if chunk_cache is None:
+        return skill_matcher.find_terms(text.lower())
+    found = set()
+    for _, chunk in split_chunks(text):
+        key = chunk_key('skills', skill_matcher.version, chunk)
+        terms = chunk_cache.get(key)
+        if terms is None:
+            terms = sorted(skill_matcher.find_terms(chunk.lower()))
+            chunk_cache.put(key, terms)
+        found.update(terms)
+    return found
+
+
+def scan_contacts_chunked(text):
+    """scan_contacts(text), re-scanning only chunks the cache has not seen"""
+    if chunk_cache is None:
+        return scan_contacts(text)
+    emails = []
+    phones = []
+    for offset, chunk in split_chunks(text):
+        key = chunk_key('contacts', '', chunk)
+        found = chunk_cache.get(key)
+        if found is None:
+            found = [[list(match) for match in matches] for matches in scan_contacts(chunk)]
+            chunk_cache.put(key, found)
+        chunk_emails, chunk_phones = found
+        emails.extend((priority, offset + pos, email) for priority, pos, email in chunk_emails)
+        phones.extend((priority, offset + pos, phone) for priority, pos, phone in chunk_phones)
+    return emails, phones
@@ -0,0 +1,279 @@
+"""Command-line batch mode: parse directories or archives of resumes across all cores.
+
+Usage::
+
+    python -m resume_parser resumes/ archive.tar.gz -o results.jsonl
+    python -m resume_parser resumes.zip --format csv -o results.csv
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import tarfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .budget import limit_worker_memory
+from .parser import process_resume_file, process_resume_path
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.txt', '.pdf', '.doc', '.docx')
+TAR_EXTENSIONS = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+MAX_MEMBER_SIZE = 16 * 1024 * 1024  # uncompressed bytes per archive member, as the web app's MAX_FILE_SIZE
+
+CSV_COLUMNS = [
+    'filename', 'success', 'name', 'email', 'phone', 'phone_e164',
+    'emails', 'phones', 'skills', 'error'
+]
+
+
+def is_resume(name):
+    return name.lower().endswith(RESUME_EXTENSIONS)
+
+
+def error_result(filename, error, error_type):
+    return {
+        'filename': filename,
+        'success': False,
+        'error': error,
+        'error_type': error_type
+    }
+
+
+def oversized_result(filename, size, limit):
+    """Error result for an archive member over the size limit, or None when it fits"""
+    if size <= limit:
+        return None
+    return error_result(
+        filename,
+        f"File too large ({size} bytes). Maximum size per file is {limit // (1024 * 1024)}MB.",
+        'FileTooLarge'
+    )
+
+
+# Raised by a corrupt, truncated or unreadable archive (BadGzipFile is an OSError)
+ARCHIVE_ERRORS = (OSError, EOFError, zlib.error, zipfile.BadZipFile, tarfile.TarError)
+
+
+def iter_inputs(paths, max_member_size=MAX_MEMBER_SIZE):
+    """Yield (filename, path, raw) work items; raw is None when the worker should read path.
+    
+    Archive members that cannot be read, or that would inflate past
+    max_member_size, are yielded as ready error results (dicts) instead; so is
+    an archive that cannot be opened or breaks off part-way.
+    """
+    for path in paths:
+        lower = path.lower()
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if is_resume(name):
+                        file_path = os.path.join(root, name)
+                        yield file_path, file_path, None
+        elif not os.path.isfile(path):
+            logger.warning(f"Skipping missing input: {path}")
+        elif lower.endswith('.zip'):
+            yield from iter_archive(path, iter_zip_members, max_member_size)
+        elif lower.endswith(TAR_EXTENSIONS):
+            yield from iter_archive(path, iter_tar_members, max_member_size)
+        else:
+            yield path, path, None
+
+
+def iter_archive(path, iter_members, max_member_size):
+    """Run an archive reader, turning a failure to open or walk the archive into an error result"""
+    try:
+        yield from iter_members(path, max_member_size)
+    except ARCHIVE_ERRORS as e:
+        logger.warning(f"Unreadable archive {path}: {str(e)}")
+        yield error_result(path, f"Archive error: {str(e)}", type(e).__name__)
+
+
+def iter_zip_members(path, max_member_size):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and is_resume(info.filename):
+                filename = f"{path}!{info.filename}"
+                # zipfile stops at the declared size and fails the CRC check if the member holds more
+                oversized = oversized_result(filename, info.file_size, max_member_size)
+                if oversized is not None:
+                    yield oversized
+                    continue
+                try:
+                    raw = archive.read(info)
+                # RuntimeError: encrypted member; NotImplementedError: unsupported compression
+                except (*ARCHIVE_ERRORS, RuntimeError, NotImplementedError) as e:
+                    yield error_result(filename, f"Processing error: {str(e)}", type(e).__name__)
+                    continue
+                yield filename, None, raw
+
+
+def iter_tar_members(path, max_member_size):
+    # Stream mode reads members in order without seeking
+    with tarfile.open(path, 'r|*') as archive:
+        for member in archive:
+            if member.isfile() and is_resume(member.name):
+                filename = f"{path}!{member.name}"
+                oversized = oversized_result(filename, member.size, max_member_size)
+                if oversized is not None:
+                    yield oversized
+                    continue
+                try:
+                    raw = archive.extractfile(member).read()
+                except ARCHIVE_ERRORS as e:
+                    # A stream cannot skip past a broken member, so the rest of the archive is lost
+                    logger.warning(f"Unreadable archive {path}: {str(e)}")
+                    yield error_result(filename, f"Processing error: {str(e)}", type(e).__name__)
+                    return
+                yield filename, None, raw
+
+
+def parse_item(filename, path, raw):
+    """Pool task: parse archive bytes, or memory-map the file at path"""
+    if raw is not None:
+        return process_resume_file(filename, raw)
+    try:
+        return process_resume_path(filename, path)
+    except OSError as e:
+        return error_result(filename, f"Processing error: {str(e)}", type(e).__name__)
+
+
+def iter_results(items, workers):
+    """Parse work items on a process pool, keeping a bounded number in flight.
+    
+    A worker that dies (e.g. killed by the OOM killer) breaks the whole pool:
+    its in-flight items get error results and a fresh pool takes the rest.
+    """
+    if workers <= 0:
+        for item in items:
+            yield item if isinstance(item, dict) else parse_item(*item)
+        return
+    
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=workers, initializer=limit_worker_memory)
+    
+    max_in_flight = workers * 4
+    pool = new_pool()
+    pending = {}
+    try:
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+                continue
+            try:
+                future = pool.submit(parse_item, *item)
+            except BrokenProcessPool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = new_pool()
+                future = pool.submit(parse_item, *item)
+            pending[future] = item[0]
+            
+            while len(pending) >= max_in_flight:
+                results, broken = wait_results(pending)
+                yield from results
+                if broken:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = new_pool()
+        
+        while pending:
+            results, _ = wait_results(pending)
+            yield from results
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def wait_results(pending):
+    """Wait for some of the pending {future: filename}; returns (results, pool broke)"""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    results = []
+    broken = False
+    for future in done:
+        filename = pending.pop(future)
+        try:
+            results.append(future.result())
+        except BrokenProcessPool as e:
+            logger.error(f"Worker pool failed while processing {filename}: {str(e)}")
+            results.append(error_result(filename, "Processing error: worker process crashed", 'WorkerCrash'))
+            broken = True
+    return results, broken
+
+
+class JsonlWriter:
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, result):
+        self.stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+class CsvWriter:
+    def __init__(self, stream):
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        self.writer.writeheader()
+    
+    def write(self, result):
+        data = result.get('data') or {}
+        self.writer.writerow({
+            'filename': result['filename'],
+            'success': result['success'],
+            'name': data.get('name', ''),
+            'email': data.get('email', ''),
+            'phone': data.get('phone', ''),
+            'phone_e164': data.get('phone_e164', ''),
+            'emails': ';'.join(data.get('emails', [])),
+            'phones': ';'.join(data.get('phones', [])),
+            'skills': ';'.join(data.get('skills', [])),
+            'error': result.get('error', '')
+        })
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog='resume-parser',
+        description='Parse resume files, directories, or zip/tar archives into JSONL or CSV.'
+    )
+    parser.add_argument('inputs', nargs='+', help='files, directories, .zip or .tar(.gz) archives')
+    parser.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'], help='output format (default: from extension, else jsonl)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='worker processes (default: all cores, 0 = parse inline)')
+    parser.add_argument('--max-file-size', type=int, default=MAX_MEMBER_SIZE,
+                        help='largest archive member to inflate, in bytes (default: 16MB)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every file')
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    writer = CsvWriter(stream) if output_format == 'csv' else JsonlWriter(stream)
+    
+    started = time.perf_counter()
+    succeeded = failed = 0
+    try:
+        for result in iter_results(iter_inputs(args.inputs, args.max_file_size), args.workers):
+            writer.write(result)
+            if result['success']:
+                succeeded += 1
+            else:
+                failed += 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    
+    elapsed = time.perf_counter() - started
+    total = succeeded + failed
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"Parsed {total} files ({succeeded} ok, {failed} failed) in {elapsed:.1f}s, {rate:.1f} docs/s",
+          file=sys.stderr)
+    return 0
@@ -0,0 +1,107 @@
+"""Email and phone extraction"""
+import os
+import re
+
+EMAIL_PATTERNS = [
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b'
+]
+
+PHONE_PATTERNS = [
+    # Indian formats - ONLY ADDITION
+    r'\+91[-.\s]?\d{10}',  # +91-9876543210
+    r'\+91[-.\s]?\d{5}[-.\s]?\d{5}',  # +91-98765-43210
+    r'91[-.\s]?\d{10}',  # 91-9876543210
+    r'\b[6-9]\d{9}\b',  # 9876543210 (Indian mobile)
+    r'\b[6-9]\d{4}[-.\s]?\d{5}\b',  # 98765-43210
+    # Original patterns
+    r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
+    r'\(\d{3}\)\s?\d{3}[-.\s]?\d{4}',
+    r'\+\d{1,3}[-.\s]?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',
+    r'\b\d{10}\b'
+]
+
+
+EMAIL_REGEXES = [re.compile(pattern) for pattern in EMAIL_PATTERNS]
+PHONE_REGEXES = [re.compile(pattern) for pattern in PHONE_PATTERNS]
+
+# Every phone pattern matches only these characters and needs at least 10 digits,
+# so one cheap pass finds the few spans worth running the priority patterns on
+PHONE_SPAN = re.compile(r'[\d+(][\d+().\s-]*')
+PHONE_MIN_DIGITS = 10
+
+PHONE_DEFAULT_COUNTRY_CODE = os.environ.get('PHONE_DEFAULT_COUNTRY_CODE', '91')
+# Bare 10-digit numbers only get the default code when they fit that country's national format
+# (an Indian mobile by default); anything else, e.g. a US number, is kept as written
+PHONE_NATIONAL_RE = re.compile(os.environ.get('PHONE_NATIONAL_PATTERN', r'[6-9]\d{9}'))
+# "(415) 555-2671", "415-555-2671", "224 214 7541": NANP grouping, never a national mobile
+PHONE_NANP_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]\d{4}')
+
+
+def scan_contacts(content):
+    """Collect every email and phone candidate in the text.
+    
+    Returns (emails, phones) as lists of (priority, position, text), where
+    priority is the index of the pattern that matched. The minimum of each
+    list is the same pick the old pattern-by-pattern search made.
+    """
+    emails = []
+    if '@' in content:
+        for priority, regex in enumerate(EMAIL_REGEXES):
+            emails = [(priority, m.start(), m.group(0)) for m in regex.finditer(content)]
+            if emails:
+                break
+    
+    phones = []
+    for span in PHONE_SPAN.finditer(content):
+        start, end = span.span()
+        if sum(char.isdigit() for char in span.group(0)) < PHONE_MIN_DIGITS:
+            continue
+        
+        # Keep one neighbouring character each side so \b sees the real context
+        offset = max(start - 1, 0)
+        window = content[offset:end + 1]
+        for priority, regex in enumerate(PHONE_REGEXES):
+            matches = [(priority, offset + m.start(), m.group(0)) for m in regex.finditer(window)]
+            if matches:
+                phones.extend(matches)
+                break
+    
+    return emails, phones
+
+
+def normalize_phone(phone):
+    """Normalize a matched phone number to E.164, or None if it cannot be.
+    
+    Numbers without a country code are only completed with
+    PHONE_DEFAULT_COUNTRY_CODE when they carry a trunk '0' or fit
+    PHONE_NATIONAL_RE; for anything else the country is unknown.
+    """
+    digits = re.sub(r'\D', '', phone)
+    
+    if phone.lstrip().startswith('+'):
+        pass
+    elif len(digits) == 12 and digits.startswith('91'):
+        pass
+    elif len(digits) == 11 and digits.startswith('0'):
+        digits = PHONE_DEFAULT_COUNTRY_CODE + digits[1:]
+    elif len(digits) == 10 and PHONE_NATIONAL_RE.fullmatch(digits) and not PHONE_NANP_RE.fullmatch(phone.strip()):
+        digits = PHONE_DEFAULT_COUNTRY_CODE + digits
+    else:
+        return None
+    
+    if not 8 <= len(digits) <= 15:
+        return None
+    return '+' + digits
+
+
+def rank_contacts(candidates):
+    """Order (priority, position, text) candidates best-first, dropping repeats"""
+    ranked = []
+    seen = set()
+    for _, _, text in sorted(candidates):
+        key = text.lower()
+        if key not in seen:
+            seen.add(key)
+            ranked.append(text)
+    return ranked
@@ -0,0 +1,191 @@
+"""Near-duplicate detection: MinHash signatures of resume text and an LSH index"""
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+
+logger = logging.getLogger(__name__)
+
+# Signature layout: MINHASH_SIZE slots split into LSH_BANDS bands of rows. A pair at
+# Jaccard s shares a band with probability 1 - (1 - s**rows)**bands: with 16 bands of
+# 4 rows that is ~99.98% at 0.8 (8 bands of 8 rows only reached ~77%), ~99% at 0.7
+# and ~64% at 0.5; those extra candidates cost a signature comparison each.
+# Band keys are rebuilt from the stored signatures on load, so persisted indexes
+# need no migration when the banding changes.
+MINHASH_SIZE = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_SIZE // LSH_BANDS
+SHINGLE_WORDS = 4
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', 0.8))
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+SHINGLE_PRIME = 0x100000001B3
+SHINGLE_MIX = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+SLOT_SHIFT = 64 - (MINHASH_SIZE.bit_length() - 1)
+VALUE_SHIFT = SLOT_SHIFT - 32
+DIGEST_BYTES = 32
+RECORD = struct.Struct(f'<{DIGEST_BYTES}s{MINHASH_SIZE}I')
+EMPTY_SLOT = 0xFFFFFFFF
+
+
+def minhash_signature(text):
+    """One-permutation MinHash of the text's 4-word shingles, or None when it has no words.
+
+    Each word is hashed once with crc32 and each shingle hash is a
+    multiplicative mix of its four word hashes, so the loop is plain integer
+    arithmetic. The top bits of a shingle hash pick a slot and the next 32
+    compete for that slot's minimum. Slots no shingle landed in borrow the
+    next filled slot's value (rotation densification), so short texts still
+    get comparable signatures. Unlike hash(), crc32 is stable across
+    processes, so signatures can be persisted.
+    """
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return None
+
+    crc32 = zlib.crc32
+    hashes = [crc32(word.encode()) for word in words]
+    # Texts shorter than one shingle become a single padded shingle
+    hashes += [0] * (SHINGLE_WORDS - len(hashes))
+    slots = [EMPTY_SLOT] * MINHASH_SIZE
+    for a, b, c, d in zip(hashes, hashes[1:], hashes[2:], hashes[3:]):
+        h = ((((a * SHINGLE_PRIME + b) * SHINGLE_PRIME + c) * SHINGLE_PRIME + d) * SHINGLE_MIX) & HASH_MASK
+        slot = h >> SLOT_SHIFT
+        value = (h >> VALUE_SHIFT) & EMPTY_SLOT
+        if value < slots[slot]:
+            slots[slot] = value
+
+    # Rotation densification: an empty slot takes the next filled slot's value (wrapping
+    # around), offset by its own index; walking backwards carries that value down
+    carry = next(value for value in slots if value != EMPTY_SLOT)
+    for slot in range(MINHASH_SIZE - 1, -1, -1):
+        if slots[slot] != EMPTY_SLOT:
+            carry = slots[slot]
+        else:
+            slots[slot] = (carry + (slot + 1) * 0x9E3779B1) & 0xFFFFFFFF
+    return slots
+
+
+def signature_similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / MINHASH_SIZE
+
+
+class MinHashIndex:
+    """LSH index of MinHash signatures keyed by document id (a sha256 hex digest).
+
+    Signatures live in one flat array and each band maps its row tuple to the
+    positions that share it, so a query is LSH_BANDS dict lookups plus a
+    signature comparison per candidate, independent of the index size.
+
+    With a path, records are appended to a flat file and replayed on load.
+    Other processes appending to the same file are picked up on the next
+    query or add, so gunicorn workers converge on one index.
+    """
+
+    def __init__(self, path=None, threshold=DEDUP_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.ids = []
+        self.positions = {}
+        self.signatures = array('I')
+        self.bands = [{} for _ in range(LSH_BANDS)]
+        self.offset = 0
+        self.lock = threading.Lock()
+        if path:
+            self._refresh()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _band_keys(signature):
+        # hash() of an int tuple is not salted per process, and one int per band is far
+        # smaller than keeping the tuples; collisions only add candidates that fail the check
+        return [hash(tuple(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])) for band in range(LSH_BANDS)]
+
+    def _insert(self, doc_id, signature):
+        # Caller holds self.lock
+        if doc_id in self.positions:
+            return
+        position = len(self.ids)
+        self.ids.append(doc_id)
+        self.positions[doc_id] = position
+        self.signatures.extend(signature)
+        for table, key in zip(self.bands, self._band_keys(signature)):
+            bucket = table.get(key)
+            if bucket is None:
+                # A lone position is stored bare; most buckets never get a second entry
+                table[key] = position
+            elif isinstance(bucket, list):
+                bucket.append(position)
+            else:
+                table[key] = [bucket, position]
+
+    def _refresh(self):
+        # Caller holds self.lock (or is __init__); replay whole records appended since the last read
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+                if end - self.offset < RECORD.size:
+                    return
+                f.seek(self.offset)
+                data = f.read((end - self.offset) // RECORD.size * RECORD.size)
+        except FileNotFoundError:
+            return
+
+        for fields in RECORD.iter_unpack(data):
+            self._insert(fields[0].hex(), fields[1:])
+        self.offset += len(data)
+
+    def query(self, signature, exclude=None, limit=5):
+        """[(doc_id, similarity), ...] of indexed documents at or above the threshold, best first"""
+        with self.lock:
+            if self.path:
+                self._refresh()
+            candidates = set()
+            for table, key in zip(self.bands, self._band_keys(signature)):
+                bucket = table.get(key)
+                if bucket is None:
+                    continue
+                if isinstance(bucket, list):
+                    candidates.update(bucket)
+                else:
+                    candidates.add(bucket)
+
+            matches = []
+            for position in candidates:
+                doc_id = self.ids[position]
+                if doc_id == exclude:
+                    continue
+                start = position * MINHASH_SIZE
+                similarity = signature_similarity(signature, self.signatures[start:start + MINHASH_SIZE])
+                if similarity >= self.threshold:
+                    matches.append((doc_id, round(similarity, 3)))
+
+        matches.sort(key=lambda match: -match[1])
+        return matches[:limit]
+
+    def add(self, doc_id, signature):
+        """Index a document's signature (and append it to the file when persisted)"""
+        with self.lock:
+            if doc_id in self.positions:
+                return
+            if not self.path:
+                self._insert(doc_id, signature)
+                return
+
+            # Write, then replay from the file, so records from every process land in one order
+            try:
+                with open(self.path, 'ab') as f:
+                    f.write(RECORD.pack(bytes.fromhex(doc_id), *signature))
+            except OSError as e:
+                logger.warning(f"Dedup index write failed: {str(e)}")
+                self._insert(doc_id, signature)
+                return
+            self._refresh()
@@ -0,0 +1,415 @@
+"""Text extraction for PDF, DOCX, legacy DOC and plain-text resumes"""
+import codecs
+import logging
+import os
+import re
+import struct
+import xml.etree.ElementTree as ET
+import zipfile
+
+from .budget import BudgetExceeded
+from .ole import OLE_SIGNATURE, OleFile
+
+# Import for document processing
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+logger = logging.getLogger(__name__)
+
+# Bounded cost for huge PDFs
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))  # pages read per PDF
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 500000))  # characters read per PDF
+
+
+def iter_pdf_pages(file, budget=None):
+    """Yield the text of each PDF page lazily, stopping at the page and character caps
+
+    With a ParseBudget, each page's text is charged to it, so a runaway PDF stops between pages.
+    """
+    max_pages = PDF_MAX_PAGES
+    max_chars = PDF_MAX_CHARS
+    
+    try:
+        if not PyPDF2:
+            # Fallback to binary reading if PyPDF2 not available
+            file.seek(0)
+            yield file.read().decode('utf-8', errors='ignore')[:max_chars]
+            return
+        
+        file.seek(0)
+        
+        # Use PyPDF2 to extract text
+        pdf_reader = PyPDF2.PdfReader(file)
+        pages = pdf_reader.pages
+    except Exception as e:
+        # Decoding a broken PDF's bytes as text only feeds binary noise to the parser
+        logger.warning(f"PDF extraction failed: {str(e)}")
+        raise ValueError(f"Unreadable PDF: {str(e)}") from e
+    
+    chars = 0
+    for page_number, page in enumerate(pages):
+        if page_number >= max_pages:
+            logger.info(f"PDF page cap reached ({max_pages} of {len(pages)} pages read)")
+            return
+        
+        try:
+            page_text = page.extract_text()
+        except Exception as e:
+            logger.warning(f"PDF page {page_number + 1} extraction failed: {str(e)}")
+            continue
+        
+        if not page_text:
+            continue
+        if budget is not None:
+            budget.charge(len(page_text))
+        
+        if chars + len(page_text) > max_chars:
+            logger.info(f"PDF character cap reached ({max_chars} chars) on page {page_number + 1}")
+            yield page_text[:max_chars - chars]
+            return
+        
+        chars += len(page_text)
+        yield page_text
+
+def extract_pdf_text(file):
+    """Extract text from PDF file"""
+    return '\n'.join(iter_pdf_pages(file))
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_HEADER_PART = re.compile(r'^word/header\d*\.xml$')
+DOCX_FOOTER_PART = re.compile(r'^word/footer\d*\.xml$')
+
+
+def iter_docx_xml_paragraphs(stream):
+    """Yield paragraph text from a WordprocessingML stream with incremental parsing"""
+    # Paragraphs can nest (text boxes), so each open paragraph collects its own runs
+    paragraphs = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == WORD_NAMESPACE + 'p':
+                paragraphs.append([])
+            continue
+        
+        runs = paragraphs[-1] if paragraphs else []
+        if tag == WORD_NAMESPACE + 't':
+            runs.append(elem.text or '')
+        elif tag == WORD_NAMESPACE + 'tab':
+            runs.append('\t')
+        elif tag in (WORD_NAMESPACE + 'br', WORD_NAMESPACE + 'cr'):
+            runs.append('\n')
+        elif tag == WORD_NAMESPACE + 'p':
+            text = ''.join(paragraphs.pop()).strip()
+            if text:
+                yield text
+        
+        # Paragraph, cell and row text has been consumed; drop the subtree
+        if tag in (WORD_NAMESPACE + 'p', WORD_NAMESPACE + 'tc', WORD_NAMESPACE + 'tr', WORD_NAMESPACE + 'tbl'):
+            elem.clear()
+
+
+class _BudgetedStream:
+    """Read-only stream wrapper that charges every inflated byte to a ParseBudget"""
+    
+    def __init__(self, stream, budget):
+        self.stream = stream
+        self.budget = budget
+    
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.budget.charge(len(data))
+        return data
+
+
+def iter_docx_paragraphs(file, budget=None):
+    """Yield DOCX paragraphs (headers, body incl. tables, then footers) without loading the archive into memory
+
+    With a ParseBudget, the inflated XML is charged to it as it streams, so a zip bomb stops early.
+    """
+    file.seek(0)
+    with zipfile.ZipFile(file, 'r') as zip_file:
+        names = zip_file.namelist()
+        part_names = (
+            sorted(n for n in names if DOCX_HEADER_PART.match(n))
+            + ['word/document.xml']
+            + sorted(n for n in names if DOCX_FOOTER_PART.match(n))
+        )
+        
+        for part_name in part_names:
+            with zip_file.open(part_name) as stream:
+                yield from iter_docx_xml_paragraphs(stream if budget is None else _BudgetedStream(stream, budget))
+
+
+def extract_docx_text(file):
+    """Extract text from DOCX file, one line per paragraph"""
+    try:
+        return '\n'.join(iter_docx_paragraphs(file))
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedFormatError(f"Not a readable DOCX file: {str(e)}") from e
+
+
+# Byte-order marks, longest first so UTF-32 LE is not mistaken for UTF-16 LE
+TEXT_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+TEXT_SNIFF_BYTES = 64 * 1024
+
+
+def detect_encoding(raw):
+    """Pick a text encoding from a BOM or a UTF-8 check of the first 64KB"""
+    head = bytes(raw[:4])
+    for bom, encoding in TEXT_BOMS:
+        if head.startswith(bom):
+            return encoding
+    
+    sample = bytes(raw[:TEXT_SNIFF_BYTES])
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is still UTF-8
+        if e.start < len(sample) - 3 or len(sample) < TEXT_SNIFF_BYTES:
+            return 'latin-1'
+    return 'utf-8'
+
+
+def decode_text(raw):
+    """Decode a plain-text upload (bytes, mmap or any buffer) with a single decode pass"""
+    encoding = detect_encoding(raw)
+    # Invalid UTF-8 past the sniffed prefix is replaced rather than triggering a second full decode
+    return str(raw, encoding, 'replace')
+
+
+class UnsupportedFormatError(ValueError):
+    """An upload whose content is not a resume format we can read"""
+
+
+class NoTextLayerError(ValueError):
+    """A scanned PDF or image: there is no text to extract without OCR"""
+
+
+# Word 97-2003 binary format (MS-DOC): the FIB at the start of the WordDocument stream
+# locates the piece table (CLX) in the table stream; pieces map character positions to text
+WORD_IDENT = 0xA5EC
+WORD_FIB_ENCRYPTED = 0x0100
+WORD_FIB_TABLE_1 = 0x0200
+WORD_95_MAX_NFIB = 105
+WORD_CLX_INDEX = 33
+WORD_PIECE_COMPRESSED = 0x40000000
+WORD_FIELD_MARKS = re.compile('[\x13\x14\x15]')
+WORD_CONTROL_CHARS = re.compile('[\x00-\x08\x0e-\x1f]')
+WORD_SPECIAL_CHARS = str.maketrans({
+    '\r': '\n',  # paragraph end
+    '\x07': '\n',  # table cell / row end
+    '\x0b': '\n',  # line break
+    '\x0c': '\n',  # page / section break
+    '\x1e': '-',  # non-breaking hyphen
+})
+
+
+def _iter_doc_pieces(word, clx, limit):
+    """Yield the text of each piece in a CLX, in character-position order, up to ``limit`` characters.
+    
+    Descriptors may point anywhere in the WordDocument stream, so without the
+    limit a small piece table could expand into far more text than the file has.
+    """
+    pos = 0
+    # Skip Prc entries (formatting), then read the PlcPcd: n+1 positions, then n 8-byte descriptors
+    while pos < len(clx) and clx[pos] == 0x01:
+        pos += 3 + struct.unpack_from('<H', clx, pos + 1)[0]
+    if pos + 5 > len(clx) or clx[pos] != 0x02:
+        raise ValueError('Corrupt .doc piece table')
+    size = struct.unpack_from('<I', clx, pos + 1)[0]
+    plc = clx[pos + 5:pos + 5 + size]
+    count = (len(plc) - 4) // 12
+    positions = struct.unpack_from(f'<{count + 1}i', plc, 0)
+    for index in range(count):
+        if limit <= 0:
+            return
+        fc = struct.unpack_from('<I', plc, (count + 1) * 4 + index * 8 + 2)[0]
+        chars = min(max(positions[index + 1] - positions[index], 0), limit)
+        limit -= chars
+        if fc & WORD_PIECE_COMPRESSED:
+            # 8-bit piece: cp1252 bytes at half the stored offset
+            start = (fc & ~WORD_PIECE_COMPRESSED) // 2
+            yield word[start:start + chars].decode('cp1252', 'replace')
+        else:
+            yield word[fc:fc + chars * 2].decode('utf-16-le', 'replace')
+
+
+def _clean_doc_text(text):
+    """Plain text from Word's stored text: field results kept, field codes and control marks dropped"""
+    if '\x13' in text:
+        # Fields are \x13 code \x14 result \x15 and nest; keep only text outside any field code
+        parts = []
+        in_code = []
+        pos = 0
+        for mark in WORD_FIELD_MARKS.finditer(text):
+            if not any(in_code):
+                parts.append(text[pos:mark.start()])
+            char = mark.group()
+            if char == '\x13':
+                in_code.append(True)
+            elif in_code and char == '\x14':
+                in_code[-1] = False
+            elif in_code:
+                in_code.pop()
+            pos = mark.end()
+        if not any(in_code):
+            parts.append(text[pos:])
+        text = ''.join(parts)
+    return WORD_CONTROL_CHARS.sub('', text.translate(WORD_SPECIAL_CHARS))
+
+
+def extract_doc_text(raw, budget=None):
+    """Extract text from a legacy Word .doc (bytes or memory map): header/footer text, then the body"""
+    try:
+        ole = OleFile(raw)
+        word = ole.read_stream('WordDocument')
+    except KeyError:
+        raise UnsupportedFormatError('OLE file is not a Word document (no WordDocument stream)')
+    if len(word) < 0x20 or struct.unpack_from('<H', word, 0)[0] != WORD_IDENT:
+        raise UnsupportedFormatError('OLE file is not a Word document')
+    
+    nfib, = struct.unpack_from('<H', word, 0x02)
+    flags, = struct.unpack_from('<H', word, 0x0A)
+    if flags & WORD_FIB_ENCRYPTED:
+        raise UnsupportedFormatError('Encrypted .doc files are not supported')
+    if nfib <= WORD_95_MAX_NFIB:
+        # Word 6/95 keeps the document text as one 8-bit run between fcMin and fcMac
+        fc_min, fc_mac = struct.unpack_from('<II', word, 0x18)
+        return _clean_doc_text(word[fc_min:fc_mac].decode('cp1252', 'replace'))
+    
+    table = ole.read_stream('1Table' if flags & WORD_FIB_TABLE_1 else '0Table')
+    if budget is not None:
+        budget.charge(len(word) + len(table))
+    # FibBase, then counted blocks of shorts and longs, then the fc/lcb pairs
+    csw, = struct.unpack_from('<H', word, 0x20)
+    longs = 0x22 + csw * 2
+    cslw, = struct.unpack_from('<H', word, longs)
+    longs += 2
+    ccp_text, ccp_footnotes, ccp_headers = struct.unpack_from('<iii', word, longs + 12)
+    fc_clx, lcb_clx = struct.unpack_from('<II', word, longs + cslw * 4 + 2 + WORD_CLX_INDEX * 8)
+    # Only the stories up to the headers are used, so no more characters than those are decoded.
+    # Every character takes at least one byte of the stream, so overlapping pieces cannot
+    # expand past its size either.
+    limit = min(max(ccp_text, 0) + max(ccp_footnotes, 0) + max(ccp_headers, 0), len(word))
+    pieces = []
+    for piece in _iter_doc_pieces(word, table[fc_clx:fc_clx + lcb_clx], limit):
+        if budget is not None:
+            budget.charge(len(piece))
+        pieces.append(piece)
+    text = ''.join(pieces)
+    
+    # Stories follow each other: main text, footnotes, then headers/footers; headers go first like DOCX
+    headers_start = ccp_text + max(ccp_footnotes, 0)
+    headers = text[headers_start:headers_start + max(ccp_headers, 0)]
+    return _clean_doc_text(headers + '\r' + text[:ccp_text] if headers else text[:ccp_text])
+
+
+# Leading bytes per format; PDFs may have junk before the header, so it is searched for
+IMAGE_SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a', b'II*\x00', b'MM\x00*')
+ZIP_SIGNATURE = b'PK\x03\x04'
+PDF_SIGNATURE = b'%PDF-'
+SNIFF_BYTES = 1024
+BINARY_SNIFF_BYTES = 4096
+
+
+def sniff_format(raw):
+    """Format of an upload from its leading bytes: pdf, docx, doc, image, binary or text"""
+    head = bytes(raw[:SNIFF_BYTES])
+    if head.startswith(OLE_SIGNATURE):
+        return 'doc'
+    if head.startswith(ZIP_SIGNATURE):
+        return 'docx'
+    if head.startswith(IMAGE_SIGNATURES):
+        return 'image'
+    if PDF_SIGNATURE in head:
+        return 'pdf'
+    if not head.startswith(tuple(bom for bom, _ in TEXT_BOMS)) and b'\x00' in bytes(raw[:BINARY_SNIFF_BYTES]):
+        return 'binary'
+    return 'text'
+
+
+def pdf_has_text_layer(raw):
+    """Cheap check for text in a PDF: page text needs a font resource.
+
+    False means definitely no text (a scanned page image). Fonts inside
+    compressed object streams are invisible to a byte search, so a PDF with
+    object streams counts as possibly having text.
+    """
+    return raw.find(b'/Font') != -1 or raw.find(b'/ObjStm') != -1
+
+
+# Sniffed format -> func(raw, file, budget) returning the document text as an iterable of pages
+EXTRACTORS = {}
+
+
+def register_extractor(fmt):
+    """Decorator registering the page extractor for a sniffed format"""
+    def decorator(func):
+        EXTRACTORS[fmt] = func
+        return func
+    return decorator
+
+
+def extract_pages(raw, file, budget=None):
+    """(format, pages) for an upload, dispatched on its content rather than its filename"""
+    fmt = sniff_format(raw)
+    return fmt, EXTRACTORS[fmt](raw, file, budget)
+
+
+@register_extractor('text')
+def _text_pages(raw, file, budget):
+    return [decode_text(raw)]
+
+
+@register_extractor('docx')
+def _docx_pages(raw, file, budget):
+    paragraphs = []
+    try:
+        for paragraph in iter_docx_paragraphs(file, budget):
+            paragraphs.append(paragraph)
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedFormatError(f"Not a readable DOCX file: {str(e)}") from e
+    except BudgetExceeded:
+        # The budget records the overrun; the paragraphs read so far are still parsed
+        pass
+    return ['\n'.join(paragraphs)]
+
+
+@register_extractor('doc')
+def _doc_pages(raw, file, budget):
+    return [extract_doc_text(raw, budget)]
+
+
+@register_extractor('pdf')
+def _pdf_pages(raw, file, budget):
+    # Scanned PDFs are rejected before PyPDF2 parses a single page
+    if not pdf_has_text_layer(raw):
+        raise NoTextLayerError('PDF has no text layer (scanned pages); run OCR before uploading')
+    return _require_text(iter_pdf_pages(file, budget))
+
+
+def _require_text(pages):
+    found = False
+    for page in pages:
+        found = found or bool(page.strip())
+        yield page
+    if not found:
+        raise NoTextLayerError('PDF pages contain no extractable text; run OCR before uploading')
+
+
+@register_extractor('image')
+def _image_pages(raw, file, budget):
+    raise NoTextLayerError('Image files have no text layer; run OCR before uploading')
+
+
+@register_extractor('binary')
+def _binary_pages(raw, file, budget):
+    raise UnsupportedFormatError('Unrecognized binary file; supported formats are .txt, .pdf, .doc and .docx')
@@ -0,0 +1,126 @@
+"""Candidate name extraction"""
+import os
+import re
+
+from .timing import stage_timer
+
+# Skip common header words
+NAME_SKIP_WORDS = frozenset({
+    'resume', 'cv', 'curriculum', 'vitae', 'profile', 'summary', 'objective',
+    'experience', 'education', 'skills', 'contact', 'information', 'personal',
+    'details', 'phone', 'email', 'mobile', 'address', 'linkedin', 'github'
+})
+# Substring test for all skip words in one pass
+NAME_SKIP_RE = re.compile('|'.join(sorted(NAME_SKIP_WORDS)))
+
+# Look for "Name:" or "Full Name:" labels
+NAME_LABEL_RE = re.compile(
+    r'(?:Name|Full Name)\s*:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]*\.?)*\s+[A-Z][a-z]+)',
+    re.IGNORECASE | re.MULTILINE
+)
+NAME_LINE_RES = [
+    # Standard name patterns at line start
+    re.compile(r'^([A-Z][a-z]{1,15}(?:\s+[A-Z][a-z]*\.?)*\s+[A-Z][a-z]{1,15})$'),
+    # Name with middle initial
+    re.compile(r'^([A-Z][a-z]{1,15}\s+[A-Z]\.\s+[A-Z][a-z]{1,15})$'),
+    # Three part names
+    re.compile(r'^([A-Z][a-z]{1,15}\s+[A-Z][a-z]{1,15}\s+[A-Z][a-z]{1,15})$')
+]
+NAME_DIGITS_RE = re.compile(r'\d{3,}')
+NAME_CAPITALIZED_RE = re.compile(r'\b[A-Z][a-z]{2,15}\b')
+NAME_PART_RE = re.compile(r'^[A-Za-z\.\']+$')
+NAME_REJECT_PARTS = frozenset({'resume', 'email', 'phone', 'contact', 'address', 'skills'})
+
+# Names sit at the top of a resume; nothing past these bounds is searched
+NAME_SCAN_LINES = int(os.environ.get('NAME_SCAN_LINES', 20))
+NAME_SCAN_CHARS = int(os.environ.get('NAME_SCAN_CHARS', 5000))
+
+
+def extract_name_from_content(lines, content, timings=None):
+    """Enhanced name extraction with better patterns.
+    
+    Runs three bounded stages in order (labeled name, leading lines, any two
+    capitalized words) over the first NAME_SCAN_CHARS characters. Pass a dict
+    as ``timings`` to get seconds spent per stage.
+    """
+    head = content[:NAME_SCAN_CHARS]
+    
+    # Search the document head first for labeled names
+    with stage_timer(timings, 'name_label'):
+        match = NAME_LABEL_RE.search(head)
+        if match:
+            potential_name = match.group(1).strip()
+            if validate_name(potential_name):
+                return potential_name
+    
+    # Then search line by line for names at the beginning
+    with stage_timer(timings, 'name_lines'):
+        for line in lines[:NAME_SCAN_LINES]:
+            line_clean = line.strip()
+            
+            # Skip very short or very long lines
+            if len(line_clean) < 3 or len(line_clean) > 80:
+                continue
+            
+            # Skip lines with common resume headers
+            if NAME_SKIP_RE.search(line_clean.lower()):
+                continue
+            
+            # Skip lines with @ or many numbers or special chars
+            if '@' in line_clean or NAME_DIGITS_RE.search(line_clean) or line_clean.count('.') > 2:
+                continue
+            
+            # Skip lines that are mostly uppercase (likely headers)
+            if line_clean.isupper() and len(line_clean) > 8:
+                continue
+            
+            # Try name patterns on this line
+            for pattern in NAME_LINE_RES:
+                match = pattern.match(line_clean)
+                if match:
+                    potential_name = match.group(1).strip()
+                    if validate_name(potential_name):
+                        return potential_name
+    
+    # Last resort: the first two consecutive capitalized words that are not header words.
+    # Such a pair always passes validate_name, so each word is checked once and dropped early.
+    with stage_timer(timings, 'name_fallback'):
+        previous = None
+        for match in NAME_CAPITALIZED_RE.finditer(head):
+            word = match.group(0)
+            if NAME_SKIP_RE.search(word.lower()):
+                previous = None
+                continue
+            if previous:
+                return f"{previous} {word}"
+            previous = word
+    
+    return 'Not found'
+
+def validate_name(name):
+    """Enhanced name validation"""
+    if not name or len(name.split()) < 2:
+        return False
+        
+    parts = name.split()
+    
+    # Should have 2-4 parts
+    if len(parts) < 2 or len(parts) > 4:
+        return False
+    
+    # Check each part
+    for part in parts:
+        # Should be reasonable length
+        if len(part) < 2 or len(part) > 20:
+            return False
+        # Should start with capital
+        if not part[0].isupper():
+            return False
+        # Should be mostly letters (allow . for middle initials)
+        if not NAME_PART_RE.match(part):
+            return False
+        # Avoid common non-name words
+        if part.lower() in NAME_REJECT_PARTS:
+            return False
+    
+    return True
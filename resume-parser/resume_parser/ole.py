@@ -0,0 +1,132 @@
+"""Minimal reader for OLE compound files (CFB), the container format of legacy .doc files"""
+import struct
+import sys
+from array import array
+
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# Sector numbers above MAX_REGULAR_SECTOR are markers (end of chain, free, FAT/DIFAT sectors)
+MAX_REGULAR_SECTOR = 0xFFFFFFFA
+NO_STREAM = 0xFFFFFFFF
+HEADER_DIFAT_ENTRIES = 109
+
+HEADER = struct.Struct('<8s16sHHHHH6sIIIIIIIII')
+DIRECTORY_ENTRY = struct.Struct('<64sHBBIII16sIQQIQ')
+STREAM_ENTRY = 2
+ROOT_ENTRY = 5
+
+
+def _sector_table(data):
+    table = array('I', data[:len(data) // 4 * 4])
+    if sys.byteorder == 'big':
+        table.byteswap()
+    return table
+
+
+class OleFile:
+    """Streams of an OLE compound file held in bytes or a memory map.
+
+    Only what text extraction needs: the FAT and mini FAT, the directory, and
+    reading a stream of the root storage by name. Chains are bounded by the
+    size of their sector table, so corrupt or cyclic files raise ValueError
+    instead of looping or
+    reading the same sectors over and over.
+    """
+
+    def __init__(self, raw):
+        if len(raw) < 512 or bytes(raw[:8]) != OLE_SIGNATURE:
+            raise ValueError('Not an OLE compound file')
+        (_, _, _, major, _, sector_shift, mini_shift, _, _, fat_count, first_directory, _,
+         self.mini_cutoff, first_mini_fat, _, first_difat, difat_count) = HEADER.unpack_from(raw, 0)
+        if sector_shift not in (9, 12) or mini_shift != 6:
+            raise ValueError('Unsupported OLE sector size')
+        self.raw = raw
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_shift
+
+        # The header holds the first 109 FAT sector numbers; DIFAT sectors chain the rest.
+        # Counts come from the file, so they are bounded by the sectors it actually has.
+        sector_count = len(raw) // self.sector_size
+        difat = list(_sector_table(bytes(raw[HEADER.size:HEADER.size + HEADER_DIFAT_ENTRIES * 4])))
+        sector = first_difat
+        seen = set()
+        for _ in range(min(difat_count, sector_count)):
+            if sector > MAX_REGULAR_SECTOR:
+                break
+            if sector in seen:
+                raise ValueError('Corrupt OLE DIFAT chain')
+            seen.add(sector)
+            entries = _sector_table(self._sector(sector))
+            difat.extend(entries[:-1])
+            sector = entries[-1]
+        fat_sectors = [sector for sector in difat[:min(fat_count, sector_count)] if sector <= MAX_REGULAR_SECTOR]
+        self.fat = _sector_table(b''.join(self._sector(sector) for sector in fat_sectors))
+
+        directory = self._read_chain(first_directory)
+        self.entries = [
+            DIRECTORY_ENTRY.unpack_from(directory, offset)
+            for offset in range(0, len(directory) - DIRECTORY_ENTRY.size + 1, DIRECTORY_ENTRY.size)
+        ]
+        if not self.entries or self.entries[0][2] != ROOT_ENTRY:
+            raise ValueError('OLE file has no root storage')
+        # Version 3 files may leave garbage in the high half of stream sizes
+        self.size_mask = 0xFFFFFFFF if major == 3 else (1 << 64) - 1
+
+        root = self.entries[0]
+        self.mini_stream = self._read_chain(root[11], root[12] & self.size_mask)
+        self.mini_fat = array('I')
+        if first_mini_fat <= MAX_REGULAR_SECTOR:
+            self.mini_fat = _sector_table(self._read_chain(first_mini_fat))
+
+    def _sector(self, sector):
+        offset = (sector + 1) * self.sector_size
+        if offset + self.sector_size > len(self.raw):
+            raise ValueError('OLE sector out of range')
+        return bytes(self.raw[offset:offset + self.sector_size])
+
+    def _chain(self, start, table):
+        sectors = []
+        seen = set()
+        while start <= MAX_REGULAR_SECTOR:
+            if start >= len(table) or start in seen:
+                raise ValueError('Corrupt OLE sector chain')
+            seen.add(start)
+            sectors.append(start)
+            start = table[start]
+        return sectors
+
+    def _read_chain(self, start, size=None):
+        data = b''.join(self._sector(sector) for sector in self._chain(start, self.fat))
+        return data if size is None else data[:size]
+
+    def _read_mini_chain(self, start, size):
+        step = self.mini_sector_size
+        data = b''.join(
+            self.mini_stream[sector * step:(sector + 1) * step] for sector in self._chain(start, self.mini_fat)
+        )
+        return data[:size]
+
+    def root_streams(self):
+        """{name: directory entry index} for the streams directly under the root storage"""
+        streams = {}
+        pending = [self.entries[0][6]]
+        seen = set()
+        # Children form a red-black tree through the left/right sibling links
+        while pending:
+            index = pending.pop()
+            if index == NO_STREAM or index >= len(self.entries) or index in seen:
+                continue
+            seen.add(index)
+            name, name_length, kind, _, left, right = self.entries[index][:6]
+            if kind == STREAM_ENTRY:
+                streams[name[:max(name_length - 2, 0)].decode('utf-16-le', 'replace')] = index
+            pending.extend((left, right))
+        return streams
+
+    def read_stream(self, name):
+        """Contents of a root-level stream; KeyError when there is none by that name"""
+        entry = self.entries[self.root_streams()[name]]
+        start, size = entry[11], entry[12] & self.size_mask
+        if size < self.mini_cutoff:
+            return self._read_mini_chain(start, size)
+        return self._read_chain(start, size)
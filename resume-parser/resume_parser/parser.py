@@ -0,0 +1,303 @@
+"""Resume parsing pipeline: extracted text in, structured fields out"""
+import io
+import logging
+import mmap
+import os
+
+from .budget import BudgetExceeded, ParseBudget
+from .chunks import find_terms_chunked, scan_contacts_chunked
+from .contacts import normalize_phone, rank_contacts
+from .dedup import minhash_signature
+from .extract import extract_pages
+from .names import extract_name_from_content
+from .sections import HEADER_SECTION, SectionSegmenter
+from .skills import get_skill_matcher
+from .timing import format_timings, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Bump when parsing logic changes so cached results from older code are ignored
+PARSER_VERSION = '11'
+# Stop reading pages once the name, an email, a phone and a finished skills section are in hand
+PARSE_STOP_EARLY = os.environ.get('PARSE_STOP_EARLY', '1') != '0'
+
+
+# Sections searched first per field; the rest of the document is only scanned when these come up empty
+CONTACT_SECTIONS = frozenset({HEADER_SECTION, 'contact'})
+SKILL_SECTIONS = frozenset({'skills', 'summary', 'projects', 'certifications'})
+SKILL_FALLBACK_SECTIONS = frozenset({'experience'})
+
+
+def parse_resume_pages(pages, timings=None, budget=None, stop_early=PARSE_STOP_EARLY):
+    """Parse resume text that arrives in chunks (e.g. PDF pages).
+    
+    Each page is split into sections as it arrives, and each field looks in
+    its own sections first: contacts and the name in the header/contact
+    blocks, skills in the skills/summary/projects/certifications blocks.
+    Other blocks are kept aside and scanned only when those come up empty
+    (experience first for skills), so company names and referees' details
+    do not leak into the result. Returns None when the pages contain no
+    text. Pass a dict as ``timings`` to get seconds spent per stage.
+    
+    Blocks are scanned in content-defined chunks whose skill and contact
+    hits are cached by fingerprint, so a revised resume only re-scans the
+    chunks around its edits; the merged hits are the same as a full scan.
+    
+    With a ParseBudget, the budget is checked after every page. Once it is
+    exceeded no further pages are read and the fallback scans are skipped,
+    so the result holds what the pages read so far yielded.
+    
+    With ``stop_early``, no further pages are pulled once the header has
+    given a name, an email and a phone have been found, and a skills section
+    has been read to its end (a later heading closed it). Lazy page sources
+    then skip extracting the remaining pages; contacts or skills that only
+    appear on those pages are not reported.
+    """
+    skill_matcher = get_skill_matcher()
+    segmenter = SectionSegmenter()
+    texts = []
+    header = []
+    emails = []
+    phones = []
+    terms = set()
+    blocks = []
+    name = None
+    skills_seen = False
+    
+    def scan_block_contacts(page_number, offset, text, want_emails=True, want_phones=True):
+        block_emails, block_phones = scan_contacts_chunked(text)
+        if want_emails:
+            emails.extend((priority, (page_number, offset + pos), email) for priority, pos, email in block_emails)
+        if want_phones:
+            phones.extend((priority, (page_number, offset + pos), phone) for priority, pos, phone in block_phones)
+    
+    pages = iter(pages)
+    page_number = 0
+    while True:
+        try:
+            # Lazy page sources (PDF) do their extraction work here
+            with stage_timer(timings, 'extract'):
+                page = next(pages, None)
+            if page is None:
+                break
+            page_number += 1
+            
+            if not page.strip():
+                continue
+            
+            # Clean content - ORIGINAL LOGIC
+            page = page.replace('\r\n', '\n').replace('\r', '\n')
+            texts.append(page)
+            
+            with stage_timer(timings, 'sections'):
+                page_blocks = segmenter.feed(page)
+            
+            for section, offset, text in page_blocks:
+                blocks.append((section, page_number, offset, text))
+                if section == HEADER_SECTION:
+                    header.append(text)
+                if section in CONTACT_SECTIONS:
+                    with stage_timer(timings, 'contacts'):
+                        scan_block_contacts(page_number, offset, text)
+                if section in SKILL_SECTIONS:
+                    with stage_timer(timings, 'skills'):
+                        terms.update(find_terms_chunked(skill_matcher, text))
+                skills_seen = skills_seen or section == 'skills'
+            
+            if budget is not None:
+                budget.check()
+            
+            if (stop_early and emails and phones and terms and skills_seen
+                    and segmenter.section != 'skills' and segmenter.headings):
+                # The header ends at the first heading, so its name is final
+                if name is None:
+                    name = header_name(header, timings)
+                if name != 'Not found':
+                    logger.debug(f"Stopped reading pages after page {page_number}: all fields found")
+                    close = getattr(pages, 'close', None)
+                    if close is not None:
+                        close()
+                    break
+        except BudgetExceeded:
+            # Keep what the pages read so far produced
+            break
+    truncated = budget is not None and budget.exceeded is not None
+    
+    if not texts:
+        return None
+    
+    # Fall back to the other sections only for fields the primary sections did not yield
+    if (not emails or not phones) and not truncated:
+        with stage_timer(timings, 'contacts'):
+            want_emails, want_phones = not emails, not phones
+            for section, page_number, offset, text in blocks:
+                if section not in CONTACT_SECTIONS:
+                    scan_block_contacts(page_number, offset, text, want_emails, want_phones)
+    
+    if not terms and not truncated:
+        with stage_timer(timings, 'skills'):
+            # Experience first, then whatever is left (the whole text when there are no headings)
+            fallback = [text for section, _, _, text in blocks if section in SKILL_FALLBACK_SECTIONS]
+            rest = [text for section, _, _, text in blocks
+                    if section not in SKILL_SECTIONS and section not in SKILL_FALLBACK_SECTIONS]
+            for group in (fallback, rest):
+                for text in group:
+                    terms.update(find_terms_chunked(skill_matcher, text))
+                if terms:
+                    break
+    
+    content = '\n'.join(texts)
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
+    skills = skill_matcher.canonical(terms)
+    
+    # Best candidate first, by the original pattern priority order
+    emails = rank_contacts(emails)
+    phones = rank_contacts(phones)
+    phone_numbers = []
+    for phone in phones:
+        number = normalize_phone(phone) or phone
+        if number not in phone_numbers:
+            phone_numbers.append(number)
+    
+    # Extract name from the header block, then from the whole document if the header has none
+    if name is None:
+        name = header_name(header, timings) if segmenter.headings else 'Not found'
+    if name == 'Not found':
+        name = extract_name_from_content(lines, content, timings)
+    
+    return {
+        'name': name,
+        'email': emails[0] if emails else 'Not found',
+        'phone': phones[0] if phones else 'Not found',
+        'phone_e164': (normalize_phone(phones[0]) or 'Not found') if phones else 'Not found',
+        'emails': emails,
+        'phones': phone_numbers,
+        'skills': skills if skills else ['Not specified'],
+        'skill_categories': skill_matcher.categorize(skills)
+    }
+
+def header_name(header, timings=None):
+    """Name from the header blocks (the text before the first heading), or 'Not found'"""
+    header_content = ''.join(header)
+    header_lines = [line.strip() for line in header_content.split('\n') if line.strip()]
+    if not header_lines:
+        return 'Not found'
+    return extract_name_from_content(header_lines, header_content, timings)
+
+
+def parse_resume_content(content, timings=None):
+    """Parse one whole text: parse_resume_pages on a single page, with every field present even for empty text"""
+    parsed = parse_resume_pages([content], timings)
+    if parsed is None:
+        return {
+            'name': 'Not found',
+            'email': 'Not found',
+            'phone': 'Not found',
+            'phone_e164': 'Not found',
+            'emails': [],
+            'phones': [],
+            'skills': ['Not specified'],
+            'skill_categories': {}
+        }
+    return parsed
+
+
+def process_resume_file(filename, raw, file=None, signature=False):
+    """Extract and parse one uploaded file; runs inside pool workers
+
+    raw may be bytes or a memory map; file, when given, is a seekable handle on the same data.
+    With ``signature`` the result also carries the MinHash signature of the extracted text.
+    A file that runs out of its ParseBudget returns what was parsed so far with ``truncated``
+    set, or a BudgetExceeded error when nothing was.
+    """
+    timings = {}
+    budget = ParseBudget()
+    try:
+        logger.info(f"Processing file: {filename}")
+        
+        if file is None:
+            file = io.BytesIO(raw)
+        
+        with budget.enforce():
+            # Dispatch on the sniffed content, not the extension; PDFs are extracted lazily page by page
+            with stage_timer(timings, 'extract'):
+                _, pages = extract_pages(raw, file, budget)
+            
+            texts = []
+            if signature:
+                pages = _collect(pages, texts)
+            # The signature covers the whole text, so every page has to be read
+            parsed_data = parse_resume_pages(pages, timings, budget, stop_early=PARSE_STOP_EARLY and not signature)
+            
+            if parsed_data is None:
+                if budget.exceeded:
+                    raise BudgetExceeded(budget.exceeded)
+                raise ValueError("File appears to be empty or unreadable")
+            
+            result = {
+                'filename': filename,
+                'success': True,
+                'data': parsed_data
+            }
+            if budget.exceeded:
+                result['truncated'] = True
+                result['budget_exceeded'] = budget.exceeded
+                logger.warning(f"{budget.exceeded} budget exceeded for {filename}; returning partial results")
+            if signature and not budget.exceeded:
+                # A partial text would index a misleading signature, and hashing it costs more CPU
+                with stage_timer(timings, 'minhash'):
+                    result['signature'] = minhash_signature('\n'.join(texts))
+        result['timings'] = format_timings(timings)
+        
+        logger.info(f"Successfully processed: {filename}")
+        return result
+    
+    except BudgetExceeded as e:
+        logger.error(f"Error processing {filename}: {str(e)}")
+        return {
+            'filename': filename or 'unknown',
+            'success': False,
+            'error': f"Processing error: {str(e)}",
+            'error_type': 'BudgetExceeded',
+            'budget_exceeded': e.resource,
+            'timings': format_timings(timings)
+        }
+    
+    except MemoryError:
+        # The pool process hit its PARSE_WORKER_MEMORY_LIMIT; the file's allocations are freed by now
+        logger.error(f"Error processing {filename}: out of memory")
+        return {
+            'filename': filename or 'unknown',
+            'success': False,
+            'error': "Processing error: memory limit exceeded",
+            'error_type': 'BudgetExceeded',
+            'budget_exceeded': 'memory',
+            'timings': format_timings(timings)
+        }
+        
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {str(e)}")
+        return {
+            'filename': filename or 'unknown',
+            'success': False,
+            'error': f"Processing error: {str(e)}",
+            'error_type': type(e).__name__,
+            'timings': format_timings(timings)
+        }
+
+
+def process_resume_path(filename, path, signature=False):
+    """Parse a file on disk through a read-only memory map instead of reading it into bytes"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return process_resume_file(filename, b'', signature=signature)
+        # Text is decoded straight from the map; DOCX/PDF readers seek the real file handle
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return process_resume_file(filename, mapped, f, signature)
+
+
+def _collect(pages, texts):
+    """Pass pages through while keeping a copy of each for the duplicate signature"""
+    for page in pages:
+        texts.append(page)
+        yield page
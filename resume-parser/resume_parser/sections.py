@@ -0,0 +1,121 @@
+"""Resume section segmentation by heading detection"""
+import re
+
+from .skills import _build_trie_regex
+
+# Canonical section -> heading phrases (matched case-insensitively as a whole line)
+SECTION_HEADINGS = {
+    'contact': [
+        'contact', 'contact details', 'contact information', 'contact info',
+        'personal details', 'personal information', 'personal info',
+    ],
+    'summary': [
+        'summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+        'objective', 'career objective', 'about me',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'it skills', 'software skills',
+        'skill set', 'skillset', 'skills and tools', 'skills & tools', 'core competencies', 'competencies',
+        'technologies', 'tools and technologies', 'tools & technologies', 'technical expertise',
+        'areas of expertise', 'expertise', 'technical proficiency', 'programming languages',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'relevant experience',
+        'employment', 'employment history', 'work history', 'career history',
+        'internship', 'internships',
+    ],
+    'projects': [
+        'projects', 'academic projects', 'key projects', 'personal projects', 'project details',
+        'project experience',
+    ],
+    'education': [
+        'education', 'educational qualification', 'educational qualifications', 'academic qualifications',
+        'academic background', 'qualifications', 'academics', 'education and training',
+    ],
+    'certifications': [
+        'certifications', 'certification', 'certificates', 'courses', 'training', 'trainings',
+        'licenses and certifications',
+    ],
+    'other': [
+        'achievements', 'awards', 'honors', 'honours', 'hobbies', 'interests', 'languages known',
+        'declaration', 'references', 'publications', 'strengths', 'activities',
+        'extracurricular activities', 'extra curricular activities',
+    ],
+}
+# Text before the first heading: name and contact lines
+HEADER_SECTION = 'header'
+
+HEADING_SECTIONS = {phrase: section for section, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+
+
+def _heading_pattern(phrases, flags=re.IGNORECASE):
+    """Regex for a heading line, with the phrases factored into a trie.
+
+    A heading is a whole line holding one phrase, optionally behind a bullet
+    or numbering and followed by a colon; "Skills: Python, Java" opens the
+    section with the rest of the line in it. The pattern starts at the
+    newline before the line, so the regex engine can skip ahead to newlines
+    instead of trying every position.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return re.compile(
+        r'\n[^\S\n]*(?:[^\w\n]{1,3}|\d{1,2}\.)?[^\S\n]*('
+        + _build_trie_regex(trie).replace(r'\ ', r'[^\S\n]+')
+        + r')[^\S\n]*(?::[^\S\n]*(.*?))?[^\S\n]*$',
+        flags | re.MULTILINE
+    )
+
+
+HEADING_RE = _heading_pattern(HEADING_SECTIONS)
+# Case-sensitive twin for already lowercased ASCII text, where it matches the same spans at
+# roughly half the cost (the phrases are lowercase)
+HEADING_LOWER_RE = _heading_pattern(HEADING_SECTIONS, 0)
+HEADING_SPACE_RE = re.compile(r'\s+')
+
+
+class SectionSegmenter:
+    """Splits resume text into sections in one pass, a page at a time.
+
+    ``feed`` returns the page as (section, offset, text) blocks, where offset
+    is the block's start in the page. The current section carries over to
+    the next page, so a section may span pages. Heading lines themselves are
+    not part of any block.
+    """
+
+    def __init__(self):
+        self.section = HEADER_SECTION
+        self.headings = 0
+
+    def feed(self, page, lowered=None):
+        """Blocks of one page; ``lowered`` is page.lower() when the caller has it already"""
+        blocks = []
+        start = 0
+        if lowered is not None and page.isascii():
+            pattern, text = HEADING_LOWER_RE, lowered
+        else:
+            pattern, text = HEADING_RE, page
+        # A leading newline lets a heading on the page's first line match too; offsets shift by one
+        for match in pattern.finditer('\n' + text):
+            heading_start = match.start()
+            if heading_start > start:
+                blocks.append((self.section, start, page[start:heading_start]))
+            phrase = HEADING_SPACE_RE.sub(' ', match.group(1).lower())
+            self.section = HEADING_SECTIONS[phrase]
+            self.headings += 1
+            start = match.start(2) - 1 if match.group(2) else match.end() - 1
+        if start < len(page):
+            blocks.append((self.section, start, page[start:]))
+        return blocks
+
+
+def segment_sections(content):
+    """{section: text} for a whole document; sections that repeat are joined"""
+    sections = {}
+    for section, _, text in SectionSegmenter().feed(content):
+        sections[section] = sections[section] + '\n' + text if section in sections else text
+    return sections
@@ -0,0 +1,299 @@
+"""Skill taxonomy loading and the compiled single-pass skill matcher"""
+import csv
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Skill taxonomy (canonical names, synonyms, categories) and its compiled index cache
+SKILL_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy', 'skills.json')
+)
+SKILL_TAXONOMY_CHECK_INTERVAL = float(os.environ.get('SKILL_TAXONOMY_CHECK_INTERVAL', 5))
+SKILL_INDEX_CACHE_VERSION = 5
+
+# Characters that may not touch a keyword for it to count as a whole-word hit
+SKILL_BOUNDARY = 'a-z0-9'
+SKILL_WORD_RE = re.compile(rf'[{SKILL_BOUNDARY}]+')
+SKILL_WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789')
+# Byte table turning UTF-8 text into its runs of word characters separated by spaces
+SKILL_WORD_TABLE = bytes(c if chr(c) in SKILL_WORD_CHARS else 0x20 for c in range(256))
+
+
+def _build_trie_regex(node):
+    """Render a character trie as a regex that factors out shared prefixes"""
+    terminal = '' in node
+    branches = [re.escape(char) + _build_trie_regex(child)
+                for char, child in sorted(node.items()) if char != '']
+    
+    if not branches:
+        return ''
+    
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if terminal:
+        # Greedy optional: the longest keyword is tried first, shorter ones on backtrack
+        body = '(?:' + body + ')?'
+    return body
+
+
+class SkillMatcher:
+    """Finds every term of a skill taxonomy in one linear scan of the text.
+    
+    The terms are compiled into a single prefix-factored regex, so the cost
+    per character stays flat as the taxonomy grows. Terms that occur as whole
+    words inside a longer term (e.g. 'linux' in 'embedded linux') or that start
+    inside it and run past its end (e.g. 'c++' in 'embedded c++') are reported
+    alongside it, matching the old per-keyword substring behaviour.
+    
+    ``terms`` is either a list of keywords (reported title-cased) or a mapping
+    of lowercase term -> canonical skill name.
+    """
+    
+    def __init__(self, terms, categories=None, version=''):
+        if not isinstance(terms, dict):
+            terms = {term: term.title() for term in terms}
+        self.terms = {k.lower().strip(): v for k, v in terms.items() if k and k.strip()}
+        self.categories = dict(categories or {})
+        self.version = version
+        
+        trie = {}
+        for term in self.terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = True
+        
+        if self.terms:
+            self.pattern = re.compile(
+                rf'(?<![{SKILL_BOUNDARY}])({_build_trie_regex(trie)})(?![{SKILL_BOUNDARY}])'
+            )
+        else:
+            self.pattern = None
+        
+        # Terms implied by a longer term match, resolved once up front
+        self.implied = {}
+        for term in self.terms:
+            inner = self._inner_terms(term, self.terms)
+            if inner:
+                self.implied[term] = inner
+        
+        # Word index for batch matching: single-word terms are found by set intersection,
+        # longer terms by substring search when all their words occur
+        self.word_terms = {}
+        self.phrase_terms = {}
+        for term in self.terms:
+            words = SKILL_WORD_RE.findall(term)
+            if words == [term]:
+                self.word_terms[term.encode()] = term
+            else:
+                self.phrase_terms.setdefault(words[0].encode() if words else b'', []).append(
+                    (term, frozenset(word.encode() for word in words[1:]))
+                )
+        self.overlaps = self._overlapping_terms(self.terms)
+    
+    @staticmethod
+    def _overlapping_terms(known):
+        """term -> offsets inside it where another term starts and runs past its end.
+        
+        With "embedded c" and "c++", the regex consumes "embedded c" in
+        "embedded c++" and would never report "c++", so matches of such terms
+        are re-scanned from these offsets.
+        """
+        overlaps = {}
+        for a in known:
+            for i in range(1, len(a)):
+                if a[i - 1] in SKILL_WORD_CHARS:
+                    continue
+                suffix = a[i:]
+                if any(len(b) > len(suffix) and b.startswith(suffix) and b[len(suffix)] not in SKILL_WORD_CHARS
+                       for b in known):
+                    overlaps.setdefault(a, []).append(i)
+        return overlaps
+    
+    @staticmethod
+    def _inner_terms(term, known):
+        """Other terms that would match as whole words inside this one"""
+        boundary = re.compile(rf'[^{SKILL_BOUNDARY}]')
+        starts = [i for i in range(len(term)) if i == 0 or boundary.match(term[i - 1])]
+        ends = [j for j in range(1, len(term) + 1) if j == len(term) or boundary.match(term[j])]
+        return {
+            term[i:j] for i in starts for j in ends
+            if i < j and (i, j) != (0, len(term)) and term[i:j] in known
+        }
+    
+    def find_terms(self, content_lower):
+        """Return the set of taxonomy terms found in lowercased text"""
+        found = set()
+        if self.pattern is None:
+            return found
+        
+        for match in self.pattern.finditer(content_lower):
+            pending = [match]
+            while pending:
+                match = pending.pop()
+                term = match.group(1)
+                found.add(term)
+                found.update(self.implied.get(term, ()))
+                for offset in self.overlaps.get(term, ()):
+                    inner = self.pattern.match(content_lower, match.start(1) + offset)
+                    if inner is not None:
+                        pending.append(inner)
+        return found
+    
+    def find_terms_many(self, contents_lower):
+        """find_terms for each of many lowercased texts, without running the regex over each.
+        
+        A term occurs as a whole word exactly when its word characters form
+        whole runs in the text, so single-word terms come from intersecting
+        each text's set of words with the taxonomy, and multi-word or symbol
+        terms are only searched for when all their words are present. This
+        does a fraction of the regex's per-character work and gives the same
+        sets.
+        """
+        results = []
+        phrase_words = self.phrase_terms.keys()
+        for content in contents_lower:
+            words = set(content.encode('utf-8', 'replace').translate(SKILL_WORD_TABLE).split())
+            found = {self.word_terms[word] for word in self.word_terms.keys() & words}
+            for word in phrase_words & words | ({b''} if b'' in self.phrase_terms else set()):
+                for term, other_words in self.phrase_terms[word]:
+                    if not other_words <= words:
+                        continue
+                    pos = content.find(term)
+                    while pos != -1:
+                        end = pos + len(term)
+                        if ((pos == 0 or content[pos - 1] not in SKILL_WORD_CHARS)
+                                and (end == len(content) or content[end] not in SKILL_WORD_CHARS)):
+                            found.add(term)
+                            break
+                        pos = content.find(term, pos + 1)
+            results.append(found)
+        return results
+    
+    def canonical(self, terms):
+        """Map matched terms to sorted canonical skill names"""
+        return sorted({self.terms[term] for term in terms})
+    
+    def find(self, content_lower):
+        """Return the sorted canonical skill names found in lowercased text"""
+        return self.canonical(self.find_terms(content_lower))
+    
+    def categorize(self, skills):
+        """Group canonical skill names by their taxonomy category"""
+        grouped = {}
+        for skill in skills:
+            category = self.categories.get(skill)
+            if category:
+                grouped.setdefault(category, []).append(skill)
+        return grouped
+
+
+def load_skill_taxonomy(path):
+    """Read a JSON or CSV taxonomy into (term -> canonical, canonical -> category)"""
+    terms = {}
+    categories = {}
+    
+    if path.lower().endswith('.csv'):
+        # Columns: name, category, synonyms (separated by '|')
+        with open(path, newline='', encoding='utf-8') as f:
+            entries = [
+                {
+                    'name': row.get('name', ''),
+                    'category': row.get('category', ''),
+                    'synonyms': [s for s in (row.get('synonyms') or '').split('|') if s.strip()]
+                }
+                for row in csv.DictReader(f)
+            ]
+    else:
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f).get('skills', [])
+    
+    for entry in entries:
+        name = (entry.get('name') or '').strip()
+        if not name:
+            continue
+        if entry.get('category'):
+            categories[name] = entry['category'].strip()
+        for term in [name] + list(entry.get('synonyms') or []):
+            term = term.lower().strip()
+            if term:
+                terms.setdefault(term, name)
+    
+    return terms, categories
+
+
+def build_skill_matcher(path):
+    """Build the skill index for a taxonomy file, reusing the binary cache when fresh"""
+    stat = os.stat(path)
+    cache_path = path + '.cache'
+    cache_key = (SKILL_INDEX_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, matcher = pickle.load(f)
+        if cached_key == cache_key:
+            return matcher
+    except Exception:
+        # Missing, stale or unreadable cache (e.g. pickled by older code); rebuild below
+        pass
+    
+    with open(path, 'rb') as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+    terms, categories = load_skill_taxonomy(path)
+    matcher = SkillMatcher(terms, categories, version)
+    
+    # Write atomically so concurrent workers never read a half-written cache
+    try:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((cache_key, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write skill index cache {cache_path}: {str(e)}")
+    
+    logger.info(f"Built skill index from {path}: {len(matcher.terms)} terms, version {version}")
+    return matcher
+
+
+_skill_matcher = None
+_skill_matcher_mtime = None
+_skill_matcher_checked = 0.0
+_skill_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """Return the current skill index, reloading it if the taxonomy file changed"""
+    global _skill_matcher, _skill_matcher_mtime, _skill_matcher_checked
+    
+    now = time.monotonic()
+    if _skill_matcher is not None and now - _skill_matcher_checked < SKILL_TAXONOMY_CHECK_INTERVAL:
+        return _skill_matcher
+    
+    with _skill_matcher_lock:
+        if _skill_matcher is not None and now - _skill_matcher_checked < SKILL_TAXONOMY_CHECK_INTERVAL:
+            return _skill_matcher
+        _skill_matcher_checked = now
+        
+        try:
+            mtime = os.stat(SKILL_TAXONOMY_PATH).st_mtime_ns
+            if _skill_matcher is None or mtime != _skill_matcher_mtime:
+                _skill_matcher = build_skill_matcher(SKILL_TAXONOMY_PATH)
+                _skill_matcher_mtime = mtime
+        except Exception as e:
+            # Keep serving the last good index if the file is missing or malformed
+            logger.error(f"Skill taxonomy load failed for {SKILL_TAXONOMY_PATH}: {str(e)}")
+            if _skill_matcher is None:
+                _skill_matcher = SkillMatcher({})
+    
+    return _skill_matcher
+
+
+# Build the index at import time so the first request does not pay for it
+get_skill_matcher()
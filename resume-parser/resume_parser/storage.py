@@ -0,0 +1,137 @@
+"""SQLite connections shared by threads and processes, and an LRU cache tiered over them"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteConnections:
+    """Connections to one SQLite file, one per thread and per process.
+
+    sqlite handles must not cross a fork, so a connection opened before a
+    fork is replaced on first use in the child. ``schema`` statements run on
+    every new connection and must be idempotent (CREATE ... IF NOT EXISTS).
+    """
+
+    def __init__(self, path, schema=(), pragmas=('journal_mode=WAL',)):
+        self.path = path
+        self.schema = tuple(schema)
+        self.pragmas = tuple(pragmas)
+        self.local = threading.local()
+
+    def get(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            for pragma in self.pragmas:
+                conn.execute(f'PRAGMA {pragma}')
+            for statement in self.schema:
+                conn.execute(statement)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+
+class TieredCache:
+    """An in-process LRU in front of an optional SQLite table that processes on the host share.
+
+    The LRU is bounded by the total ``_weigh`` of its values (1 each unless a
+    subclass says otherwise). Values reach the table as text through
+    ``_dump`` and come back through ``_load``; subclasses pick the in-memory
+    form. ``stats`` counts memory_hits, disk_hits, misses, stores and evictions.
+    """
+
+    name = 'Cache'
+
+    def __init__(self, table, max_size, disk_path=None):
+        self.table = table
+        self.max_size = max_size
+        self.disk_path = disk_path
+        self.entries = OrderedDict()
+        self.size = 0
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self.db = SQLiteConnections(disk_path, [
+            f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT, created REAL)'
+        ]) if disk_path else None
+        self.lock = threading.Lock()
+        # A pool process may fork while another thread holds the lock
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _weigh(value):
+        return 1
+
+    @staticmethod
+    def _dump(value):
+        return value
+
+    @staticmethod
+    def _load(text):
+        return text
+
+    def _count(self, event):
+        # Caller holds self.lock
+        self.stats[event] += 1
+
+    def _remember(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.size -= self._weigh(self.entries.pop(key))
+            weight = self._weigh(value)
+            if weight > self.max_size:
+                return
+            self.entries[key] = value
+            self.size += weight
+            while self.size > self.max_size:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= self._weigh(evicted)
+                self._count('evictions')
+
+    def get(self, key):
+        """Cached value for a key, or None"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self._count('memory_hits')
+                return value
+
+        if self.db is not None:
+            try:
+                row = self.db.get().execute(f'SELECT value FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} read failed: {str(e)}")
+                row = None
+            if row:
+                value = self._load(row[0])
+                self._remember(key, value)
+                with self.lock:
+                    self._count('disk_hits')
+                return value
+
+        with self.lock:
+            self._count('misses')
+        return None
+
+    def put(self, key, value):
+        """Store a value under a key in both tiers"""
+        self._remember(key, value)
+        with self.lock:
+            self._count('stores')
+
+        if self.db is not None:
+            try:
+                with self.db.get() as conn:
+                    conn.execute(
+                        f'INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)',
+                        (key, self._dump(value), time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name} write failed: {str(e)}")
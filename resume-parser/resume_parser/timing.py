@@ -0,0 +1,21 @@
+"""Per-stage timing helpers"""
+import time
+from contextlib import contextmanager
+
+
+@contextmanager
+def stage_timer(timings, stage):
+    """Add the elapsed seconds of a block to timings[stage] when timings is a dict"""
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def format_timings(timings):
+    """Stage timings in milliseconds for API responses"""
+    return {stage: round(seconds * 1000, 3) for stage, seconds in timings.items()}
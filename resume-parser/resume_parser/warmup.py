@@ -0,0 +1,77 @@
+"""Warm-up parses that build the parser's lazily created state ahead of the first request"""
+import io
+import logging
+import time
+import zipfile
+
+from .parser import process_resume_file
+from .skills import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+WARMUP_LINES = (
+    'Jane Doe',
+    'jane.doe@example.com | +1 (555) 010-0199',
+    'Skills',
+    'Python, SQL, Docker, Kubernetes, React, Machine Learning',
+    'Experience',
+    'Senior Engineer at Example Corp, 2019 - present',
+)
+
+
+def _sample_docx(lines):
+    body = ''.join(f'<w:p><w:r><w:t>{line}</w:t></w:r></w:p>' for line in lines)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        ))
+    return buffer.getvalue()
+
+
+def _sample_pdf(lines):
+    text = ' '.join(f"({line}) '" for line in lines)
+    stream = f'BT /F1 10 Tf 40 780 Td 14 TL {text} ET'
+    objects = [
+        '<< /Type /Catalog /Pages 2 0 R >>',
+        '<< /Type /Pages /Kids [4 0 R] /Count 1 >>',
+        '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents 5 0 R >>',
+        f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
+
+
+def warm_up():
+    """Build the skill index and parse one small sample per format; returns the seconds taken.
+
+    Run it in a process that forks workers afterwards (the gunicorn master
+    with --preload, a pool's parent) so the imports PyPDF2 defers, the
+    regexes compiled on first use and the skill index are built once and
+    shared copy-on-write instead of being rebuilt by every fresh worker.
+    """
+    start = time.perf_counter()
+    get_skill_matcher()
+    text = '\n'.join(WARMUP_LINES) + '\n'
+    samples = (
+        ('warmup.txt', text.encode('utf-8')),
+        ('warmup.docx', _sample_docx(WARMUP_LINES)),
+        ('warmup.pdf', _sample_pdf(WARMUP_LINES)),
+    )
+    for filename, raw in samples:
+        result = process_resume_file(filename, raw, signature=True)
+        if not result['success']:
+            logger.warning(f"Warm-up parse of {filename} failed: {result['error']}")
+    elapsed = time.perf_counter() - start
+    logger.info(f"Parser warm-up finished in {elapsed:.3f}s")
+    return elapsed
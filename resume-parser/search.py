@@ -0,0 +1,248 @@
+"""Searchable store of parsed resumes.
+
+Every successfully parsed resume is kept in a SQLite database: the parsed
+data, an exact-match table of its emails and phone numbers, and an FTS5
+table holding one token per canonical skill. Skill queries are boolean
+expressions over skill names (``Verilog AND (FPGA OR VHDL) NOT Python``)
+translated to an FTS5 MATCH, so FTS5 merges the posting lists and returns
+ids newest first without touching candidates that do not match.
+"""
+import json
+import re
+import sqlite3
+import time
+
+from resume_parser import normalize_phone
+from resume_parser.storage import SQLiteConnections
+
+SEARCH_MAX_LIMIT = 100
+
+QUERY_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+QUERY_OPERATORS = {'and': 'AND', 'or': 'OR', 'not': 'NOT', '&&': 'AND', '||': 'OR'}
+SKILL_TOKEN_RE = re.compile(r'[^a-z0-9]+')
+
+
+class SearchQueryError(ValueError):
+    """A skill query that cannot be parsed"""
+
+
+def skill_token(skill):
+    """Index token for a canonical skill name (C++ -> c_plus_plus, Node.js -> node_dot_js)"""
+    name = skill.lower().replace('+', ' plus ').replace('#', ' sharp ').replace('.', ' dot ')
+    return SKILL_TOKEN_RE.sub('_', name).strip('_')
+
+
+def parse_skill_query(query, terms=None):
+    """Translate a boolean skill query into an FTS5 MATCH expression.
+
+    Operators are AND, OR and NOT (any case) with parentheses; adjacent
+    terms are ANDed. Multi-word skills can be quoted, and runs of bare words
+    that spell a known taxonomy term are joined. ``terms`` maps lowercase
+    terms and synonyms to canonical names, so "golang" finds "Go".
+    """
+    terms = terms or {}
+    tokens = []
+    for match in QUERY_TOKEN_RE.finditer(query):
+        opening, closing, quoted, word = match.groups()
+        if opening or closing:
+            tokens.append(opening or closing)
+        elif quoted is not None:
+            tokens.append(('term', quoted))
+        elif word.lower() in QUERY_OPERATORS:
+            tokens.append(QUERY_OPERATORS[word.lower()])
+        else:
+            tokens.append(('term', word))
+    if query.strip() and not tokens:
+        raise SearchQueryError('Empty skill query')
+
+    # Join bare words into the longest known multi-word term ("machine learning")
+    joined = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if isinstance(token, tuple):
+            end = i + 1
+            while end < len(tokens) and isinstance(tokens[end], tuple):
+                end += 1
+            for stop in range(end, i + 1, -1):
+                phrase = ' '.join(text for _, text in tokens[i:stop])
+                if phrase.lower() in terms:
+                    token = ('term', phrase)
+                    i = stop - 1
+                    break
+        joined.append(token)
+        i += 1
+
+    position = 0
+
+    def peek():
+        return joined[position] if position < len(joined) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return joined[position - 1]
+
+    def parse_or():
+        parts = [parse_and()]
+        while peek() == 'OR':
+            take()
+            parts.append(parse_and())
+        return parts[0] if len(parts) == 1 else '(' + ' OR '.join(parts) + ')'
+
+    def parse_and():
+        parts = [parse_not()]
+        while peek() == 'AND' or isinstance(peek(), tuple) or peek() == '(':
+            if peek() == 'AND':
+                take()
+            parts.append(parse_not())
+        return parts[0] if len(parts) == 1 else '(' + ' AND '.join(parts) + ')'
+
+    def parse_not():
+        expression = parse_atom()
+        while peek() == 'NOT':
+            take()
+            expression = f'({expression} NOT {parse_atom()})'
+        return expression
+
+    def parse_atom():
+        token = take() if peek() is not None else None
+        if token == '(':
+            expression = parse_or()
+            if peek() != ')':
+                raise SearchQueryError('Unbalanced parentheses in skill query')
+            take()
+            return expression
+        if isinstance(token, tuple):
+            text = token[1].strip()
+            token_text = skill_token(terms.get(text.lower(), text))
+            if not token_text:
+                raise SearchQueryError(f'Not a skill: {text!r}')
+            return f'"{token_text}"'
+        if token == 'NOT':
+            raise SearchQueryError('NOT needs a term on its left, e.g. "Verilog NOT VHDL"')
+        raise SearchQueryError('Incomplete skill query')
+
+    expression = parse_or()
+    if peek() is not None:
+        raise SearchQueryError(f'Unexpected {peek()!r} in skill query')
+    return expression
+
+
+class CandidateIndex:
+    """Parsed resumes in SQLite, searchable by skills, email and phone"""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = SQLiteConnections(path, [
+            'CREATE TABLE IF NOT EXISTS candidates '
+            '(id INTEGER PRIMARY KEY, doc_id TEXT UNIQUE, filename TEXT, data TEXT, indexed REAL)',
+            'CREATE TABLE IF NOT EXISTS contacts '
+            '(value TEXT, candidate INTEGER, PRIMARY KEY (value, candidate)) WITHOUT ROWID',
+            'CREATE VIRTUAL TABLE IF NOT EXISTS skills USING fts5(tokens, tokenize="unicode61 tokenchars \'_\'")',
+        ], pragmas=('journal_mode=WAL', 'synchronous=NORMAL'))
+
+    @staticmethod
+    def phone_value(phone):
+        """Lookup key of a phone: E.164 when the country is known, else its bare digits"""
+        return normalize_phone(phone) or re.sub(r'\D', '', phone)
+
+    @classmethod
+    def contact_values(cls, data):
+        """Lookup keys for a parsed result: lowercase emails and phone keys"""
+        values = {email.lower() for email in data.get('emails') or []}
+        values.update(cls.phone_value(phone) for phone in data.get('phones') or [])
+        values.discard('')
+        return values
+
+    def add(self, doc_id, filename, data):
+        """Store (or replace) one parsed resume under its document id"""
+        skills = [skill for skill in data.get('skills') or [] if skill != 'Not specified']
+        with self.db.get() as conn:
+            row = conn.execute('SELECT id, data FROM candidates WHERE doc_id = ?', (doc_id,)).fetchone()
+            if row:
+                candidate, old_data = row
+                conn.execute(
+                    'UPDATE candidates SET filename = ?, data = ?, indexed = ? WHERE id = ?',
+                    (filename, json.dumps(data), time.time(), candidate)
+                )
+                # Delete by the old values so the contacts primary key is used, not a table scan
+                conn.executemany(
+                    'DELETE FROM contacts WHERE value = ? AND candidate = ?',
+                    [(value, candidate) for value in self.contact_values(json.loads(old_data))]
+                )
+                conn.execute('DELETE FROM skills WHERE rowid = ?', (candidate,))
+            else:
+                candidate = conn.execute(
+                    'INSERT INTO candidates (doc_id, filename, data, indexed) VALUES (?, ?, ?, ?)',
+                    (doc_id, filename, json.dumps(data), time.time())
+                ).lastrowid
+            conn.executemany(
+                'INSERT OR IGNORE INTO contacts (value, candidate) VALUES (?, ?)',
+                [(value, candidate) for value in self.contact_values(data)]
+            )
+            conn.execute(
+                'INSERT INTO skills (rowid, tokens) VALUES (?, ?)',
+                (candidate, ' '.join(skill_token(skill) for skill in skills))
+            )
+
+    def search(self, skills=None, email=None, phone=None, limit=20, cursor=None, terms=None):
+        """One page of matches, newest first: (results, next_cursor or None).
+
+        ``skills`` is a boolean skill query (see parse_skill_query); ``email``
+        and ``phone`` are exact lookups. All given filters must match.
+        ``cursor`` is the next_cursor of the previous page.
+        """
+        limit = max(1, min(int(limit), SEARCH_MAX_LIMIT))
+        before = int(cursor) if cursor else None
+        match = parse_skill_query(skills, terms) if skills and skills.strip() else None
+
+        contacts = []
+        if email:
+            contacts.append(email.strip().lower())
+        if phone:
+            contacts.append(self.phone_value(phone.strip()))
+
+        conn = self.db.get()
+        candidates = None
+        for value in contacts:
+            # Contact lookups are exact and tiny, so they narrow the search before anything else
+            found = {row[0] for row in conn.execute('SELECT candidate FROM contacts WHERE value = ?', (value,))}
+            candidates = found if candidates is None else candidates & found
+        if candidates is not None and not candidates:
+            return [], None
+
+        if match:
+            # Drive from FTS5 so the rowid order and LIMIT are applied inside the index scan
+            sql, column, params = 'SELECT rowid FROM skills WHERE skills MATCH ?', 'rowid', [match]
+        else:
+            sql, column, params = 'SELECT id FROM candidates WHERE 1', 'id', []
+        if before is not None:
+            sql += f' AND {column} < ?'
+            params.append(before)
+        if candidates is not None:
+            sql += f" AND {column} IN ({','.join('?' * len(candidates))})"
+            params.extend(sorted(candidates))
+        sql += f' ORDER BY {column} DESC LIMIT ?'
+        params.append(limit + 1)
+
+        try:
+            ids = [row[0] for row in conn.execute(sql, params)]
+        except sqlite3.OperationalError as e:
+            raise SearchQueryError(f'Invalid skill query: {str(e)}')
+
+        next_cursor = str(ids[limit - 1]) if len(ids) > limit else None
+        ids = ids[:limit]
+        rows = {}
+        if ids:
+            placeholders = ','.join('?' * len(ids))
+            for candidate, doc_id, filename, data, indexed in conn.execute(
+                f'SELECT id, doc_id, filename, data, indexed FROM candidates WHERE id IN ({placeholders})', ids
+            ):
+                rows[candidate] = {
+                    'id': doc_id,
+                    'filename': filename,
+                    'indexed_at': indexed,
+                    'data': json.loads(data)
+                }
+        return [rows[candidate] for candidate in ids if candidate in rows], next_cursor
@@ -0,0 +1,17 @@
+from resume_parser import BATCH_FIELDS, parse_many, parse_resume_content
+
+TEXTS = [
+    'Jane Doe\njane@example.com\n+91 98765 43210\n\nTECHNICAL SKILLS\nPython, Embedded C++, Docker\n',
+    'Ravi Kumar\r\nravi@example.com\r\nExperience:\r\nBuilt timing analysis flows with Node.js and SQL\r\n',
+    'İlker Şahin\nilker@example.com\nSkills: Kubernetes, Machine Learning\nEducation\nİstanbul\n',
+    'No headings here, just Java and power analysis work at Example Corp\n',
+    '',
+    '   \n',
+]
+
+
+def test_parse_many_matches_single_document_parse():
+    columns = parse_many(TEXTS)
+    for index, text in enumerate(TEXTS):
+        expected = parse_resume_content(text)
+        assert {field: columns[field][index] for field in BATCH_FIELDS} == expected
@@ -0,0 +1,79 @@
+import io
+import tarfile
+import zipfile
+
+from resume_parser.cli import iter_inputs
+
+RESUME = b'Jane Doe\njane@example.com\n+91 98765 43210\n\nSkills\nPython, SQL\n'
+
+
+def _tar_gz(tmp_path, count=3):
+    path = tmp_path / 'batch.tar.gz'
+    with tarfile.open(path, 'w:gz') as archive:
+        for i in range(count):
+            # Random bytes keep gzip from shrinking the members below the truncation point
+            data = RESUME + bytes(range(256)) * 200 + str(i).encode()
+            info = tarfile.TarInfo(f'resume{i}.txt')
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def _errors(items):
+    return [item for item in items if isinstance(item, dict)]
+
+
+def test_missing_archives_are_skipped(tmp_path, caplog):
+    paths = [str(tmp_path / 'gone.zip'), str(tmp_path / 'gone.tar.gz')]
+    assert list(iter_inputs(paths)) == []
+    assert caplog.text.count('Skipping missing input') == 2
+
+
+def test_corrupt_zip_becomes_an_error_row(tmp_path):
+    path = tmp_path / 'broken.zip'
+    path.write_bytes(b'not a zip at all')
+    good = tmp_path / 'good.txt'
+    good.write_bytes(RESUME)
+    
+    items = list(iter_inputs([str(path), str(good)]))
+    assert len(items) == 2
+    assert items[0]['filename'] == str(path)
+    assert items[0]['error_type'] == 'BadZipFile'
+    assert items[1] == (str(good), str(good), None)
+
+
+def test_zip_member_with_bad_crc_becomes_an_error_row(tmp_path):
+    path = tmp_path / 'batch.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('a.txt', RESUME)
+        archive.writestr('b.txt', RESUME)
+    data = path.read_bytes()
+    # Flip a byte of the first member's stored body
+    offset = data.index(RESUME) + 2
+    path.write_bytes(data[:offset] + b'#' + data[offset + 1:])
+    
+    items = list(iter_inputs([str(path)]))
+    assert [item['filename'] for item in _errors(items)] == [f'{path}!a.txt']
+    assert items[1] == (f'{path}!b.txt', None, RESUME)
+
+
+def test_truncated_tar_keeps_earlier_members(tmp_path):
+    path = _tar_gz(tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) * 2 // 3])
+    
+    items = list(iter_inputs([str(path)]))
+    errors = _errors(items)
+    assert len(errors) == 1
+    assert items[0][0] == f'{path}!resume0.txt'
+    assert items[-1] is errors[0]
+
+
+def test_garbage_tar_becomes_an_error_row(tmp_path):
+    path = tmp_path / 'batch.tar.gz'
+    path.write_bytes(b'\x1f\x8b' + b'garbage' * 10)
+    
+    items = list(iter_inputs([str(path)]))
+    assert len(items) == 1
+    assert items[0]['filename'] == str(path)
+    assert items[0]['success'] is False
@@ -0,0 +1,40 @@
+import pytest
+
+from resume_parser import normalize_phone, parse_resume_content
+
+
+@pytest.mark.parametrize('phone, expected', [
+    ('9876543210', '+919876543210'),
+    ('98765 43210', '+919876543210'),
+    ('+91-9876543210', '+919876543210'),
+    ('91-9876543210', '+919876543210'),
+    ('044-23456789', '+914423456789'),
+    ('+1 (415) 555-2671', '+14155552671'),
+])
+def test_normalize_phone_completes_national_numbers(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest.mark.parametrize('phone', [
+    '(415) 555-2671',
+    '415-555-2671',
+    '415.555.2671',
+    '224 214 7541',
+    '(615) 555-0100',
+    '4155552671',
+])
+def test_normalize_phone_leaves_nanp_numbers_alone(phone):
+    assert normalize_phone(phone) is None
+
+
+def test_parse_keeps_raw_nanp_phone():
+    parsed = parse_resume_content('Jane Doe\njane@example.com\nPhone: (415) 555-2671\n')
+    assert parsed['phone'] == '(415) 555-2671'
+    assert parsed['phone_e164'] == 'Not found'
+    assert parsed['phones'] == ['(415) 555-2671']
+
+
+def test_parse_normalizes_indian_mobile():
+    parsed = parse_resume_content('Ravi Kumar\nravi@example.com\nMobile: +91 98765 43210\n')
+    assert parsed['phone_e164'] == '+919876543210'
+    assert parsed['phones'] == ['+919876543210']
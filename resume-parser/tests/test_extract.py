@@ -0,0 +1,109 @@
+import io
+import struct
+import time
+import zipfile
+
+import pytest
+
+from benchmarks.corpus import render_cfb
+from resume_parser import UnsupportedFormatError, extract_doc_text, extract_docx_text, process_resume_file
+from resume_parser.ole import HEADER
+
+COMPRESSED = 0x40000000
+
+
+def word97(pieces, ccp_text, ccp_headers=0, table='1Table', clx=None):
+    """A Word 97 .doc laid out as Word writes it: FIB, then the text, with the piece table in a table stream.
+
+    ``pieces`` are (text, compressed) runs in character order; compressed runs are stored as cp1252.
+    ``clx`` replaces the piece table built from them.
+    """
+    body = b''
+    positions = [0]
+    descriptors = b''
+    offset = 1024
+    for text, compressed in pieces:
+        encoded = text.encode('cp1252' if compressed else 'utf-16-le')
+        fc = (offset + len(body)) * 2 | COMPRESSED if compressed else offset + len(body)
+        descriptors += struct.pack('<HIH', 0, fc, 0)
+        positions.append(positions[-1] + len(text))
+        body += encoded
+    plc = struct.pack(f'<{len(positions)}i', *positions) + descriptors
+    # One Prc (formatting) entry before the piece table, as Word writes them
+    if clx is None:
+        clx = struct.pack('<BH', 1, 2) + b'\0\0' + struct.pack('<BI', 2, len(plc)) + plc
+
+    longs = [0] * 22
+    longs[3], longs[5] = ccp_text, ccp_headers
+    pairs = [0] * (93 * 2)
+    pairs[33 * 2:33 * 2 + 2] = [0, len(clx)]
+    flags = 0x0200 if table == '1Table' else 0
+    fib = (
+        struct.pack('<HHHHHH', 0xA5EC, 0xC1, 0, 0x0409, 0, flags).ljust(32, b'\0')
+        + struct.pack('<H', 14) + b'\0' * 28
+        + struct.pack('<H22i', 22, *longs)
+        + struct.pack(f'<H{len(pairs)}I', 93, *pairs) + struct.pack('<H', 0)
+    )
+    word = (fib.ljust(offset, b'\0') + body).ljust(4096, b'\0')
+    return render_cfb({'WordDocument': word, table: clx})
+
+
+def test_docx_text_rejects_files_that_are_not_docx():
+    with pytest.raises(UnsupportedFormatError):
+        extract_docx_text(io.BytesIO(b'PK\x03\x04 not really a zip'))
+    
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zip_file:
+        zip_file.writestr('other.xml', '<x/>')
+    with pytest.raises(UnsupportedFormatError):
+        extract_docx_text(archive)
+
+
+def test_word97_document():
+    body = ['Jane Doe\rjane@example.com\r', 'Skills: Python, Ünïcode ✓\r']
+    header = 'Page \x13 PAGE \x141\x15\r'
+    # Body runs are 8-bit then UTF-16; the header story (with a PAGE field) follows the body
+    raw = word97(
+        [(body[0], True), (body[1], False), (header, True)],
+        ccp_text=len(''.join(body)), ccp_headers=len(header),
+    )
+    assert extract_doc_text(raw) == 'Page 1\n\nJane Doe\njane@example.com\nSkills: Python, Ünïcode ✓\n'
+    
+    result = process_resume_file('resume.doc', raw)
+    assert result['success']
+    assert result['data']['emails'] == ['jane@example.com']
+
+
+def test_word97_document_with_table_in_0table():
+    raw = word97([('Jane Doe\r', True)], ccp_text=9, table='0Table')
+    assert extract_doc_text(raw) == 'Jane Doe\n'
+
+
+def test_self_linked_difat_is_rejected():
+    # A DIFAT sector whose next-sector link points back at itself, with a huge DIFAT count
+    header = HEADER.pack(
+        b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', b'\0' * 16, 0x3E, 3, 0xFFFE, 9, 6, b'\0' * 6,
+        0, 1, 1, 0, 4096, 0xFFFFFFFE, 0, 0, 0xFFFFFFFF
+    ).ljust(512, b'\xff')
+    difat = struct.pack('<127I', *[0xFFFFFFFF] * 127) + struct.pack('<I', 0)
+    raw = header + difat
+    assert len(raw) == 1024
+    
+    with pytest.raises(ValueError):
+        extract_doc_text(raw)
+    result = process_resume_file('loop.doc', raw)
+    assert not result['success']
+
+
+def test_piece_table_bomb_expands_no_further_than_the_stream():
+    # 20,000 pieces that all point at the same 3KB of text and claim 2**31 characters of body
+    count = 20000
+    plc = struct.pack(f'<{count + 1}i', *range(0, (count + 1) * 3072, 3072))
+    plc += struct.pack('<HIH', 0, 1024 * 2 | COMPRESSED, 0) * count
+    clx = struct.pack('<BI', 2, len(plc)) + plc
+    raw = word97([('A' * 3072, True)], ccp_text=2 ** 31 - 1, clx=clx)
+    
+    start = time.perf_counter()
+    text = extract_doc_text(raw)
+    assert time.perf_counter() - start < 2
+    assert 3072 <= len(text) <= 4096
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from jobs import JobStore
+
+
+def result(filename, success=True):
+    return {'filename': filename, 'success': success}
+
+
+def test_any_worker_sees_progress_and_results(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    owner, other = JobStore(path), JobStore(path)
+    job_id = owner.create(2)
+    assert other.status(job_id)['status'] == 'queued'
+    
+    owner.record(job_id, 1, result('b.pdf', success=False))
+    status = other.status(job_id)
+    assert (status['status'], status['completed'], status['failed']) == ('running', 1, 1)
+    
+    owner.record(job_id, 0, result('a.pdf'))
+    status = other.status(job_id)
+    assert status['status'] == 'completed'
+    assert status['finished'] is not None
+    assert [r['filename'] for r in status['results']] == ['a.pdf', 'b.pdf']
+    # Streams follow completion order
+    assert [r['index'] for r in other.iter_results(job_id)] == [1, 0]
+
+
+def test_result_stream_waits_for_the_owner(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    owner, other = JobStore(path), JobStore(path)
+    job_id = owner.create(2)
+    
+    def finish():
+        for index in range(2):
+            time.sleep(0.05)
+            owner.record(job_id, index, result(f'{index}.txt'))
+    
+    thread = threading.Thread(target=finish)
+    thread.start()
+    streamed = [r['filename'] for r in other.iter_results(job_id, poll_interval=0.01)]
+    thread.join()
+    assert streamed == ['0.txt', '1.txt']
+
+
+def test_expire_forgets_finished_jobs_only(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    done, running = store.create(1), store.create(2)
+    store.record(done, 0, result('a.txt'))
+    store.record(running, 0, result('b.txt'))
+    
+    store.expire(time.time() + 1)
+    assert store.status(done) is None
+    assert not store.exists(done)
+    assert store.status(running)['completed'] == 1
+    assert list(store.iter_results('missing')) == []
@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+
+from metrics import MetricsRegistry
+
+
+def _total(registry, name='requests_total'):
+    counters, _ = registry._collect()
+    return sum(value for (metric, _), value in counters.items() if metric == name)
+
+
+def test_concurrent_flushes_never_lose_the_snapshot(tmp_path):
+    registry = MetricsRegistry(str(tmp_path), flush_interval=0.0)
+    totals = []
+    
+    def work():
+        for _ in range(200):
+            registry.inc('requests_total')
+            registry.maybe_flush()
+    
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        totals.append(_total(registry))
+    for thread in threads:
+        thread.join()
+    
+    assert totals == sorted(totals)
+    assert _total(registry) == 1600
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_dead_worker_totals_survive_pid_reuse(tmp_path):
+    registry = MetricsRegistry(str(tmp_path))
+    registry.inc('requests_total', 5)
+    # A worker that has exited, and a stale pid that is now this process again
+    dead = {'counters': [['requests_total', [], 7.0]], 'histograms': []}
+    (tmp_path / '999999999.deadbeef.json').write_text(json.dumps(dead))
+    
+    assert _total(registry) == 12
+    assert not (tmp_path / '999999999.deadbeef.json').exists()
+    assert (tmp_path / 'retired.json').exists()
+    
+    registry.inc('requests_total')
+    assert _total(registry) == 13
+    
+    # A new registry in a process that reuses the pid writes its own file
+    MetricsRegistry(str(tmp_path)).flush()
+    assert _total(registry) == 13
@@ -0,0 +1,43 @@
+from resume_parser import parse_resume_pages
+
+FIRST_PAGE = (
+    'Jane Doe\njane@example.com\n+91 98765 43210\n\n'
+    'Skills\nPython, SQL, Docker\n\nExperience\nBackend engineer at Acme\n'
+)
+
+
+def lazy_pages(pulled, *pages):
+    for page in pages:
+        pulled.append(page)
+        yield page
+
+
+def test_stops_reading_pages_once_every_field_is_found():
+    pulled = []
+    parsed = parse_resume_pages(lazy_pages(pulled, FIRST_PAGE, 'Projects\nKubernetes\n', 'More\n'))
+    
+    assert pulled == [FIRST_PAGE]
+    assert parsed['name'] == 'Jane Doe'
+    assert parsed['email'] == 'jane@example.com'
+    assert 'Kubernetes' not in parsed['skills']
+
+
+def test_reads_on_while_the_skills_section_may_continue():
+    pulled = []
+    first = 'Jane Doe\njane@example.com\n+91 98765 43210\n\nSkills\nPython, SQL\n'
+    parsed = parse_resume_pages(lazy_pages(pulled, first, 'Docker\n\nExperience\nAcme\n', 'Education\nIIT\n'))
+    
+    assert len(pulled) == 2
+    assert 'Docker' in parsed['skills']
+
+
+def test_reads_every_page_when_disabled_or_fields_are_missing():
+    pulled = []
+    parse_resume_pages(lazy_pages(pulled, FIRST_PAGE, 'Projects\nKubernetes\n'), stop_early=False)
+    assert len(pulled) == 2
+    
+    pulled = []
+    no_phone = FIRST_PAGE.replace('+91 98765 43210\n', '')
+    parsed = parse_resume_pages(lazy_pages(pulled, no_phone, 'Contact\n+91 91234 56789\n'))
+    assert len(pulled) == 2
+    assert parsed['phone_e164'] == '+919123456789'
@@ -0,0 +1,36 @@
+import os
+
+from resume_parser.chunks import ChunkCache
+from resume_parser.storage import SQLiteConnections, TieredCache
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TieredCache('values', 2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C')
+    
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.stats['evictions'] == 1
+
+
+def test_disk_tier_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / 'chunks.db')
+    ChunkCache(10, path).put('key', [[1, 'x']])
+    
+    other = ChunkCache(10, path)
+    assert other.get('key') == [[1, 'x']]
+    assert other.get('key') == [[1, 'x']]
+    assert other.stats['disk_hits'] == 1
+    assert other.stats['memory_hits'] == 1
+
+
+def test_connections_are_reopened_after_fork(tmp_path):
+    connections = SQLiteConnections(str(tmp_path / 'store.db'), ['CREATE TABLE IF NOT EXISTS t (x)'])
+    conn = connections.get()
+    assert connections.get() is conn
+    
+    connections.local.pid = os.getpid() + 1  # as seen by a forked child
+    assert connections.get() is not conn